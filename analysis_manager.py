@@ -1,17 +1,64 @@
 import streamlit as st
-from pymongo import MongoClient
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from pymongo import ReturnDocument, UpdateOne
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Union, Any
+from pymongo.write_concern import WriteConcern
 from bson import ObjectId
+from cachetools import TTLCache
 import json
 import hashlib
+import threading
+from dataclasses import fields
 from dotenv import load_dotenv
 import os
+from database import get_mongo_client
 from llm_analyzer import AnalysisResult, LLMAnalyzer
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library serializer
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
+# Stored analysis fields that map one-to-one onto AnalysisResult
+_AR_FIELDS = tuple(field.name for field in fields(AnalysisResult))
+
+# In-process cache of (resume_id, club_name) -> (AnalysisResult, analysis_timestamp),
+# shared across reruns so repeated views skip the MongoDB round-trip
+_memory_cache = TTLCache(maxsize=512, ttl=24 * 60 * 60)
+_memory_cache_lock = threading.Lock()
+
+def _evict_memory_cache(should_evict) -> None:
+    """Drop in-process cache entries for which should_evict(key, entry) is true"""
+    with _memory_cache_lock:
+        for key in [key for key, entry in _memory_cache.items() if should_evict(key, entry)]:
+            _memory_cache.pop(key, None)
+
+def _as_object_id(resume_id: Union[str, ObjectId]) -> ObjectId:
+    """Parse a resume ID, reusing it as-is when it is already an ObjectId"""
+    return resume_id if isinstance(resume_id, ObjectId) else ObjectId(resume_id)
+
+@st.cache_resource
+def _ensure_indexes(database_name: str) -> bool:
+    """Create indexes for efficient querying (runs once per process)"""
+    collection = get_mongo_client()[database_name].resume_analyses
+    collection.create_index([("resume_id", 1), ("club_name", 1)], unique=True)
+    collection.create_index([("analysis_timestamp", -1)])
+    collection.create_index([("match_score", -1)])
+    collection.create_index([("resume_id", 1)])
+    collection.create_index([("resume_id", 1), ("match_score", -1)])
+    # Serves the cache-check lookup, including its freshness timestamp
+    collection.create_index(
+        [("resume_id", 1), ("club_name", 1), ("analysis_timestamp", -1)],
+        name="cache_cover"
+    )
+    # Equality on club_name, then sort/range on score or timestamp
+    collection.create_index([("club_name", 1), ("match_score", -1)])
+    collection.create_index([("club_name", 1), ("analysis_timestamp", -1)])
+    return True
+
 class AnalysisDatabase:
     def __init__(self):
         # Get connection details from .env file
@@ -22,58 +69,79 @@ class AnalysisDatabase:
             st.error("MongoDB connection string not found in .env file")
             return
         
-        self.client = MongoClient(connection_string)
+        self.client = get_mongo_client()
         self.db = self.client[database_name]
         self.collection = self.db.resume_analyses
         
-        # Create indexes for efficient querying
-        self.collection.create_index([("resume_id", 1), ("club_name", 1)], unique=True)
-        self.collection.create_index([("analysis_timestamp", -1)])
-        self.collection.create_index([("match_score", -1)])
-        self.collection.create_index([("resume_id", 1)])
+        _ensure_indexes(database_name)
 
-    def save_analysis(self, resume_id: str, club_name: str, analysis_result: AnalysisResult) -> Optional[str]:
+    def _build_analysis_doc(self, resume_oid: ObjectId, club_name: str, analysis_result: AnalysisResult, analysis_timestamp: datetime) -> Dict[str, Any]:
+        """Create the analysis document stored in MongoDB"""
+        return {
+            "resume_id": resume_oid,
+            "club_name": club_name,
+            "analysis_timestamp": analysis_timestamp,
+            "networking_strategy": analysis_result.networking_strategy,
+            "campus_resources": analysis_result.campus_resources,
+            "application_timeline": analysis_result.application_timeline,
+            "preparation_steps": analysis_result.preparation_steps,
+            "improvements": analysis_result.improvements,
+            "match_score": analysis_result.match_score,
+            "strategy_summary": analysis_result.strategy_summary
+        }
+
+    def save_analysis(self, resume_id: Union[str, ObjectId], club_name: str, analysis_result: AnalysisResult) -> Optional[str]:
         """Save analysis result to MongoDB"""
         try:
-            # Create analysis document
-            analysis_doc = {
-                "resume_id": ObjectId(resume_id),
-                "club_name": club_name,
-                "analysis_timestamp": datetime.now(),
-                "networking_strategy": analysis_result.networking_strategy,
-                "campus_resources": analysis_result.campus_resources,
-                "application_timeline": analysis_result.application_timeline,
-                "preparation_steps": analysis_result.preparation_steps,
-                "improvements": analysis_result.improvements,
-                "match_score": analysis_result.match_score,
-                "strategy_summary": analysis_result.strategy_summary
-            }
+            resume_oid = _as_object_id(resume_id)
+            
+            analysis_doc = self._build_analysis_doc(resume_oid, club_name, analysis_result, datetime.now(timezone.utc))
             
-            # Use upsert to update existing analysis or create new one
-            result = self.collection.update_one(
-                {"resume_id": ObjectId(resume_id), "club_name": club_name},
+            # Upsert and return the document ID in a single round-trip
+            result = self.collection.find_one_and_update(
+                {"resume_id": resume_oid, "club_name": club_name},
                 {"$set": analysis_doc},
-                upsert=True
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
             )
+            return str(result["_id"]) if result else None
             
-            if result.upserted_id:
-                return str(result.upserted_id)
-            else:
-                # Find the existing document ID
-                existing = self.collection.find_one({"resume_id": ObjectId(resume_id), "club_name": club_name})
-                return str(existing["_id"]) if existing else None
-                
         except Exception as e:
             st.error(f"Error saving analysis: {str(e)}")
             return None
 
-    def get_analysis(self, resume_id: str, club_name: str) -> Optional[Dict[str, Any]]:
+    def save_analyses_bulk(self, resume_id: Union[str, ObjectId], results: List[Tuple[str, AnalysisResult]]) -> bool:
+        """Save several analysis results for one resume in a single round-trip"""
+        if not results:
+            return True
+        
+        try:
+            resume_oid = _as_object_id(resume_id)
+            now = datetime.now(timezone.utc)
+            operations = [
+                UpdateOne(
+                    {"resume_id": resume_oid, "club_name": club_name},
+                    {"$set": self._build_analysis_doc(resume_oid, club_name, analysis_result, now)},
+                    upsert=True
+                )
+                for club_name, analysis_result in results
+            ]
+            self.collection.bulk_write(operations, ordered=False)
+            return True
+            
+        except Exception as e:
+            st.error(f"Error saving analyses: {str(e)}")
+            return False
+
+    def get_analysis(self, resume_id: Union[str, ObjectId], club_name: str) -> Optional[Dict[str, Any]]:
         """Get specific analysis by resume ID and club name"""
         try:
-            analysis = self.collection.find_one({
-                "resume_id": ObjectId(resume_id),
-                "club_name": club_name
-            })
+            analysis = self.collection.find_one(
+                {"resume_id": _as_object_id(resume_id), "club_name": club_name},
+                projection={"_id": 0, "analysis_timestamp": 1, **{field: 1 for field in _AR_FIELDS}},
+                hint="cache_cover"
+            )
             return analysis
         except Exception as e:
             st.error(f"Error retrieving analysis: {str(e)}")
@@ -102,8 +170,14 @@ class AnalysisDatabase:
     def delete_analysis(self, analysis_id: str) -> bool:
         """Delete a specific analysis"""
         try:
-            result = self.collection.delete_one({"_id": ObjectId(analysis_id)})
-            return result.deleted_count > 0
+            deleted = self.collection.find_one_and_delete(
+                {"_id": ObjectId(analysis_id)},
+                projection={"_id": 0, "resume_id": 1, "club_name": 1}
+            )
+            if deleted is None:
+                return False
+            _evict_memory_cache(lambda key, entry: key == (str(deleted["resume_id"]), deleted["club_name"]))
+            return True
         except Exception as e:
             st.error(f"Error deleting analysis: {str(e)}")
             return False
@@ -112,6 +186,7 @@ class AnalysisDatabase:
         """Delete all analyses for a specific resume"""
         try:
             result = self.collection.delete_many({"resume_id": ObjectId(resume_id)})
+            _evict_memory_cache(lambda key, entry: key[0] == str(resume_id))
             return result.deleted_count > 0
         except Exception as e:
             st.error(f"Error deleting analyses: {str(e)}")
@@ -120,38 +195,53 @@ class AnalysisDatabase:
     def get_analysis_statistics(self) -> Dict[str, Any]:
         """Get statistics about analyses"""
         try:
-            total_analyses = self.collection.count_documents({})
+            week_ago = datetime.now(timezone.utc) - timedelta(days=7)
             
-            # Get average match score
-            avg_score_pipeline = [
-                {"$group": {"_id": None, "avg_score": {"$avg": "$match_score"}}}
-            ]
-            avg_score_result = list(self.collection.aggregate(avg_score_pipeline))
-            avg_score = avg_score_result[0]["avg_score"] if avg_score_result else 0
+            # Unfiltered total comes from collection metadata
+            total_analyses = self.collection.estimated_document_count()
             
-            # Get unique resume count
-            unique_resumes = len(self.collection.distinct("resume_id"))
-            
-            # Get unique club count
-            unique_clubs = len(self.collection.distinct("club_name"))
+            # Compute the remaining statistics in a single aggregation pass
+            stats_pipeline = [
+                {"$facet": {
+                    "average": [
+                        {"$group": {"_id": None, "avg_score": {"$avg": "$match_score"}}}
+                    ],
+                    "unique_resumes": [
+                        {"$group": {"_id": "$resume_id"}},
+                        {"$count": "count"}
+                    ],
+                    "unique_clubs": [
+                        {"$group": {"_id": "$club_name"}},
+                        {"$count": "count"}
+                    ],
+                    # Analyses from last 7 days
+                    "recent": [
+                        {"$match": {"analysis_timestamp": {"$gte": week_ago}}},
+                        {"$count": "count"}
+                    ],
+                    # Top performing clubs (highest average match scores)
+                    "top_clubs": [
+                        {"$group": {
+                            "_id": "$club_name",
+                            "avg_score": {"$avg": "$match_score"},
+                            "analysis_count": {"$sum": 1}
+                        }},
+                        {"$sort": {"avg_score": -1}},
+                        {"$limit": 5}
+                    ]
+                }}
+            ]
+            facets = next(self.collection.aggregate(stats_pipeline), {})
             
-            # Get analyses from last 7 days
-            week_ago = datetime.now() - timedelta(days=7)
-            recent_analyses = self.collection.count_documents({
-                "analysis_timestamp": {"$gte": week_ago}
-            })
+            def facet_count(name):
+                values = facets.get(name)
+                return values[0]["count"] if values else 0
             
-            # Get top performing clubs (highest average match scores)
-            top_clubs_pipeline = [
-                {"$group": {
-                    "_id": "$club_name",
-                    "avg_score": {"$avg": "$match_score"},
-                    "analysis_count": {"$sum": 1}
-                }},
-                {"$sort": {"avg_score": -1}},
-                {"$limit": 5}
-            ]
-            top_clubs = list(self.collection.aggregate(top_clubs_pipeline))
+            avg_score = facets["average"][0]["avg_score"] if facets.get("average") else 0
+            unique_resumes = facet_count("unique_resumes")
+            unique_clubs = facet_count("unique_clubs")
+            recent_analyses = facet_count("recent")
+            top_clubs = facets.get("top_clubs", [])
             
             return {
                 "total_analyses": total_analyses,
@@ -176,24 +266,41 @@ class AnalysisDatabase:
     def get_club_analysis_summary(self, club_name: str) -> Dict[str, Any]:
         """Get summary of analyses for a specific club"""
         try:
-            analyses = list(self.collection.find({"club_name": club_name}))
+            # Count recent analyses (last 30 days)
+            month_ago = datetime.now(timezone.utc) - timedelta(days=30)
             
-            if not analyses:
-                return {"count": 0, "average_score": 0, "recent_count": 0}
+            summary_pipeline = [
+                {"$match": {"club_name": club_name}},
+                {"$facet": {
+                    "stats": [
+                        {"$group": {
+                            "_id": None,
+                            "count": {"$sum": 1},
+                            "average_score": {"$avg": "$match_score"},
+                            "highest_score": {"$max": "$match_score"},
+                            "lowest_score": {"$min": "$match_score"}
+                        }}
+                    ],
+                    "recent": [
+                        {"$match": {"analysis_timestamp": {"$gte": month_ago}}},
+                        {"$count": "count"}
+                    ]
+                }}
+            ]
+            facets = next(self.collection.aggregate(summary_pipeline), {})
             
-            scores = [analysis["match_score"] for analysis in analyses]
-            avg_score = sum(scores) / len(scores)
+            if not facets.get("stats"):
+                return {"count": 0, "average_score": 0, "recent_count": 0}
             
-            # Count recent analyses (last 30 days)
-            month_ago = datetime.now() - timedelta(days=30)
-            recent_count = len([a for a in analyses if a["analysis_timestamp"] >= month_ago])
+            stats = facets["stats"][0]
+            recent = facets.get("recent")
             
             return {
-                "count": len(analyses),
-                "average_score": avg_score,
-                "recent_count": recent_count,
-                "highest_score": max(scores),
-                "lowest_score": min(scores)
+                "count": stats["count"],
+                "average_score": stats["average_score"],
+                "recent_count": recent[0]["count"] if recent else 0,
+                "highest_score": stats["highest_score"],
+                "lowest_score": stats["lowest_score"]
             }
             
         except Exception as e:
@@ -203,17 +310,13 @@ class AnalysisDatabase:
     def export_analyses_to_dict(self, resume_id: str) -> Dict[str, Any]:
         """Export all analyses for a resume to a dictionary format"""
         try:
-            analyses = self.get_analyses_for_resume(resume_id)
-            
-            export_data = {
-                "resume_id": resume_id,
-                "export_timestamp": datetime.now().isoformat(),
-                "total_analyses": len(analyses),
-                "analyses": []
-            }
+            cursor = self.collection.find(
+                {"resume_id": ObjectId(resume_id)},
+                projection={"_id": 0, "resume_id": 0}
+            ).sort("analysis_timestamp", -1).batch_size(200)
             
-            for analysis in analyses:
-                export_data["analyses"].append({
+            analyses = [
+                {
                     "club_name": analysis["club_name"],
                     "match_score": analysis["match_score"],
                     "analysis_timestamp": analysis["analysis_timestamp"].isoformat(),
@@ -223,7 +326,16 @@ class AnalysisDatabase:
                     "preparation_steps": analysis["preparation_steps"],
                     "improvements": analysis["improvements"],
                     "strategy_summary": analysis["strategy_summary"]
-                })
+                }
+                for analysis in cursor
+            ]
+            
+            export_data = {
+                "resume_id": resume_id,
+                "export_timestamp": datetime.now(timezone.utc).isoformat(),
+                "total_analyses": len(analyses),
+                "analyses": analyses
+            }
             
             return export_data
             
@@ -232,8 +344,9 @@ class AnalysisDatabase:
             return {}
 
     def close_connection(self):
-        """Close database connection"""
-        self.client.close()
+        """No-op: the MongoClient is process-scoped and shared across reruns,
+        so closing it here would force every later request to reconnect"""
+        pass
 
 class AnalysisManager:
     """High-level manager for resume analysis operations"""
@@ -243,52 +356,98 @@ class AnalysisManager:
         self.db = AnalysisDatabase()
         self.cache_duration = timedelta(hours=24)  # Cache analyses for 24 hours
 
+    def _get_cached_analysis(self, resume_id: str, club_name: str, resume_oid: Optional[ObjectId] = None) -> Optional[AnalysisResult]:
+        """Return a cached analysis if one exists and is still valid"""
+        cache_key = (resume_id, club_name)
+        with _memory_cache_lock:
+            cache_entry = _memory_cache.get(cache_key)
+        
+        # Fall back to MongoDB on an in-process cache miss
+        if cache_entry is None:
+            cached_analysis = self.db.get_analysis(resume_oid or resume_id, club_name)
+            if not cached_analysis:
+                return None
+            
+            cache_entry = (
+                AnalysisResult(**{field: cached_analysis[field] for field in _AR_FIELDS}),
+                cached_analysis["analysis_timestamp"]
+            )
+            with _memory_cache_lock:
+                _memory_cache[cache_key] = cache_entry
+        
+        # Check if cache is still valid
+        analysis_result, analysis_timestamp = cache_entry
+        if datetime.now(timezone.utc) - analysis_timestamp < self.cache_duration:
+            return analysis_result
+        return None
+
+    def _remember_analysis(self, resume_id: str, club_name: str, analysis_result: AnalysisResult):
+        """Write a freshly saved analysis through to the in-process cache"""
+        with _memory_cache_lock:
+            _memory_cache[(resume_id, club_name)] = (analysis_result, datetime.now(timezone.utc))
+
     def analyze_resume_for_club(self, resume_id: str, resume_text: str, club_data: Dict[str, Any], force_refresh: bool = False) -> Optional[AnalysisResult]:
         """Analyze resume for a specific club with caching"""
         club_name = club_data.get("Club Name", "Unknown Club")
         
         # Check cache first unless force refresh
         if not force_refresh:
-            cached_analysis = self.db.get_analysis(resume_id, club_name)
-            if cached_analysis:
-                # Check if cache is still valid
-                cache_age = datetime.now() - cached_analysis["analysis_timestamp"]
-                if cache_age < self.cache_duration:
-                    return AnalysisResult(
-                        networking_strategy=cached_analysis["networking_strategy"],
-                        campus_resources=cached_analysis["campus_resources"],
-                        application_timeline=cached_analysis["application_timeline"],
-                        preparation_steps=cached_analysis["preparation_steps"],
-                        improvements=cached_analysis["improvements"],
-                        match_score=cached_analysis["match_score"],
-                        strategy_summary=cached_analysis["strategy_summary"]
-                    )
+            cached_result = self._get_cached_analysis(resume_id, club_name)
+            if cached_result:
+                return cached_result
         
         # Perform new analysis
         if not self.analyzer.is_configured():
             st.error("LLM is not properly configured. Please check your API keys.")
             return None
         
-        analysis_result = self.analyzer.analyze_resume_for_club(resume_text, club_data)
+        analysis_result = self.analyzer.analyze_resume_for_club(resume_text, club_data, use_cache=not force_refresh)
         
         # Save to database
         if analysis_result:
             self.db.save_analysis(resume_id, club_name, analysis_result)
+            self._remember_analysis(resume_id, club_name, analysis_result)
         
         return analysis_result
 
     def analyze_resume_for_multiple_clubs(self, resume_id: str, resume_text: str, clubs_data: List[Dict[str, Any]], force_refresh: bool = False) -> Dict[str, Any]:
         """Analyze resume for multiple clubs"""
         results = []
+        uncached_clubs = []
         
+        # Parse the resume ID once for every lookup and write below
+        resume_oid = ObjectId(resume_id)
+        
+        # Serve cache hits directly; only cache misses need an LLM call
         for club_data in clubs_data:
             club_name = club_data.get("Club Name", "Unknown Club")
-            analysis_result = self.analyze_resume_for_club(resume_id, resume_text, club_data, force_refresh)
+            cached_result = None if force_refresh else self._get_cached_analysis(resume_id, club_name, resume_oid)
             
-            if analysis_result:
-                results.append((club_name, analysis_result))
+            if cached_result:
+                results.append((club_name, cached_result))
+            else:
+                uncached_clubs.append(club_data)
+        
+        if uncached_clubs:
+            if not self.analyzer.is_configured():
+                st.error("LLM is not properly configured. Please check your API keys.")
+            else:
+                # LLM calls are network-bound; the analyzer issues them concurrently
+                new_results = self.analyzer.analyze_resume_for_multiple_clubs(resume_text, uncached_clubs, use_cache=not force_refresh)
+                
+                self._save_new_results(resume_id, resume_oid, new_results)
+                results.extend(new_results)
         
-        # Generate comparative analysis
+        return self._build_comparison(results)
+
+    def _save_new_results(self, resume_id: str, resume_oid: ObjectId, new_results: List[Tuple[str, AnalysisResult]]):
+        """Persist fresh analyses in one bulk write and keep them in the in-process cache"""
+        self.db.save_analyses_bulk(resume_oid, new_results)
+        for club_name, analysis_result in new_results:
+            self._remember_analysis(resume_id, club_name, analysis_result)
+
+    def _build_comparison(self, results: List[Tuple[str, AnalysisResult]]) -> Dict[str, Any]:
+        """Rank analyses by match score for the comparison view"""
         if results:
             sorted_results = sorted(results, key=lambda x: x[1].match_score, reverse=True)
             match_scores = [result[1].match_score for result in results]
@@ -303,45 +462,99 @@ class AnalysisManager:
         
         return {"analyses": [], "top_match": None, "average_score": 0, "total_analyzed": 0}
 
+    def submit_batch_analysis(self, resume_text: str, clubs_data: List[Dict[str, Any]]) -> Optional[str]:
+        """Queue one analysis per club on the provider's batch API; returns the batch ID"""
+        if not self.analyzer.is_configured():
+            st.error("LLM is not properly configured. Please check your API keys.")
+            return None
+        return self.analyzer.submit_batch(resume_text, clubs_data)
+
+    def collect_batch_analysis(self, resume_id: str, batch_id: str, club_names: List[str]) -> Tuple[int, int, Optional[Dict[str, Any]]]:
+        """Poll a submitted batch; returns (finished, total, comparison), with comparison None until it ends.
+        Raises BatchFailedError if the batch ended without results, or the SDK's error if it could not be checked."""
+        done, total, new_results = self.analyzer.poll_batch(batch_id, club_names)
+        if new_results is None:
+            return done, total, None
+        
+        self._save_new_results(resume_id, ObjectId(resume_id), new_results)
+        return done, total, self._build_comparison(new_results)
+
     def get_resume_analysis_summary(self, resume_id: str) -> Dict[str, Any]:
         """Get summary of all analyses for a resume"""
-        analyses = self.db.get_analyses_for_resume(resume_id)
+        try:
+            summary_pipeline = [
+                {"$match": {"resume_id": ObjectId(resume_id)}},
+                {"$sort": {"match_score": -1}},
+                {"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "average_score": {"$avg": "$match_score"},
+                    "top_club": {"$first": "$club_name"},
+                    "top_score": {"$first": "$match_score"},
+                    "last_updated": {"$max": "$analysis_timestamp"}
+                }}
+            ]
+            summary = next(self.db.collection.aggregate(summary_pipeline), None)
+        except Exception as e:
+            st.error(f"Error getting resume summary: {str(e)}")
+            summary = None
         
-        if not analyses:
+        if not summary:
             return {"count": 0, "average_score": 0, "top_club": None}
         
-        scores = [analysis["match_score"] for analysis in analyses]
-        avg_score = sum(scores) / len(scores)
-        
-        # Find top match
-        top_analysis = max(analyses, key=lambda x: x["match_score"])
+        summary.pop("_id")
+        return summary
+
+    def get_summaries_for_resumes(self, resume_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get analysis summaries for several resumes in one aggregation, keyed by resume ID"""
+        if not resume_ids:
+            return {}
         
-        return {
-            "count": len(analyses),
-            "average_score": avg_score,
-            "top_club": top_analysis["club_name"],
-            "top_score": top_analysis["match_score"],
-            "last_updated": max(analysis["analysis_timestamp"] for analysis in analyses)
-        }
+        try:
+            summaries_pipeline = [
+                {"$match": {"resume_id": {"$in": [_as_object_id(resume_id) for resume_id in resume_ids]}}},
+                {"$sort": {"match_score": -1}},
+                {"$group": {
+                    "_id": "$resume_id",
+                    "count": {"$sum": 1},
+                    "average_score": {"$avg": "$match_score"},
+                    "top_club": {"$first": "$club_name"},
+                    "top_score": {"$first": "$match_score"},
+                    "last_updated": {"$max": "$analysis_timestamp"}
+                }}
+            ]
+            return {
+                str(summary.pop("_id")): summary
+                for summary in self.db.collection.aggregate(summaries_pipeline)
+            }
+        except Exception as e:
+            st.error(f"Error getting resume summaries: {str(e)}")
+            return {}
 
     def export_resume_analyses(self, resume_id: str) -> str:
         """Export all analyses for a resume as JSON string"""
         export_data = self.db.export_analyses_to_dict(resume_id)
+        if orjson is not None:
+            return orjson.dumps(export_data, option=orjson.OPT_INDENT_2, default=str).decode()
         return json.dumps(export_data, indent=2, default=str)
 
     def cleanup_old_analyses(self, days_old: int = 30) -> int:
         """Remove analyses older than specified days"""
-        cutoff_date = datetime.now() - timedelta(days=days_old)
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
         
         try:
-            result = self.db.collection.delete_many({
-                "analysis_timestamp": {"$lt": cutoff_date}
-            })
+            # Background cleanup does not need majority acknowledgement
+            collection = self.db.collection.with_options(write_concern=WriteConcern(w=1))
+            result = collection.delete_many(
+                {"analysis_timestamp": {"$lt": cutoff_date}},
+                hint=[("analysis_timestamp", -1)]
+            )
+            _evict_memory_cache(lambda key, entry: entry[1] < cutoff_date)
             return result.deleted_count
         except Exception as e:
             st.error(f"Error cleaning up old analyses: {str(e)}")
             return 0
 
     def close_connection(self):
-        """Close database connection"""
-        self.db.close_connection()
\ No newline at end of file
+        """No-op: the shared MongoClient lives for the process lifetime"""
+        pass
\ No newline at end of file
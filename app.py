@@ -1,13 +1,13 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from database import CSClubsDatabase
+from database import CSClubsDatabase, normalize_friendliness, normalize_recruitment
 from resume_manager import ResumeDatabase
 from analysis_manager import AnalysisManager
-from llm_analyzer import LLMAnalyzer
+from llm_analyzer import BatchFailedError, LLMAnalyzer
 import os
 import time
+import html
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 # Page configuration
 st.set_page_config(
@@ -17,194 +17,97 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS 
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        color: #003262;
-        text-align: center;
-        margin-bottom: 2rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #FDB515;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: 500;
-    }
-    .club-card {
-        background: linear-gradient(145deg, #f8f9fa, #e9ecef);
-        padding: 1.5rem;
-        border-radius: 15px;
-        border-left: 5px solid #003262;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        transition: transform 0.2s;
-    }
-    .club-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 12px rgba(0, 0, 0, 0.15);
-    }
-    .club-name {
-        font-size: 1.8rem;
-        font-weight: bold;
-        color: #003262;
-        margin-bottom: 0.5rem;
-    }
-    .club-acronym {
-        font-size: 1.2rem;
-        color: #666;
-        font-style: italic;
-        margin-bottom: 1rem;
-        background-color: #FDB515;
-        color: white;
-        padding: 0.2rem 0.8rem;
-        border-radius: 20px;
-        display: inline-block;
-    }
-    .field-label {
-        font-weight: bold;
-        color: #003262;
-        margin-top: 1rem;
-        font-size: 1.1rem;
-    }
-    .friendliness-very-high {
-        background-color: #d4edda;
-        color: #155724;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        font-weight: bold;
-    }
-    .friendliness-high {
-        background-color: #d1ecf1;
-        color: #0c5460;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        font-weight: bold;
-    }
-    .friendliness-medium {
-        background-color: #fff3cd;
-        color: #856404;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        font-weight: bold;
-    }
-    .friendliness-low {
-        background-color: #f8d7da;
-        color: #721c24;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        font-weight: bold;
-    }
-    .website-link {
-        background-color: #FDB515;
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 25px;
-        text-decoration: none;
-        font-weight: bold;
-        display: inline-block;
-        margin-top: 0.5rem;
-    }
-    .stats-card {
-        background: linear-gradient(145deg, #003262, #004080);
-        color: white;
-        padding: 1rem;
-        border-radius: 10px;
-        text-align: center;
-    }
-    .favorite-club-card {
-        background: linear-gradient(145deg, #fff8e1, #fff3c4);
-        padding: 1.5rem;
-        border-radius: 15px;
-        border-left: 5px solid #FDB515;
-        border-right: 3px solid #FDB515;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 6px 12px rgba(253, 181, 21, 0.2);
-        transition: transform 0.2s;
-        position: relative;
-    }
-    .favorite-club-card:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 8px 16px rgba(253, 181, 21, 0.3);
-    }
-    .favorite-star {
-        position: absolute;
-        top: 15px;
-        right: 15px;
-        font-size: 1.5rem;
-        color: #FDB515;
-        cursor: pointer;
-        transition: transform 0.2s;
-    }
-    .favorite-star:hover {
-        transform: scale(1.2);
-    }
-    .non-favorite-star {
-        position: absolute;
-        top: 15px;
-        right: 15px;
-        font-size: 1.5rem;
-        color: #ccc;
-        cursor: pointer;
-        transition: all 0.2s;
-    }
-    .non-favorite-star:hover {
-        color: #FDB515;
-        transform: scale(1.2);
-    }
-    .favorites-separator {
-        margin: 2rem 0;
-        text-align: center;
-        position: relative;
-    }
-    .favorites-separator:before {
-        content: '';
-        position: absolute;
-        top: 50%;
-        left: 0;
-        right: 0;
-        height: 2px;
-        background: linear-gradient(to right, transparent, #FDB515, transparent);
-    }
-    .favorites-separator span {
-        background: white;
-        padding: 0 1rem;
-        color: #003262;
-        font-weight: bold;
-        font-size: 1.1rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def _css():
+    """Custom CSS, read from styles.css once per process"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles.css"), encoding="utf-8") as f:
+        return f.read()
+
+# Custom CSS (Streamlit drops elements not re-emitted on a rerun, so inject it each run)
+st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
+
+@st.cache_resource
+def get_db():
+    """Shared clubs database handle, reused across reruns and sessions"""
+    return CSClubsDatabase()
+
+@st.cache_resource
+def get_resume_db():
+    """Shared resume database handle, reused across reruns and sessions"""
+    return ResumeDatabase()
+
+@st.cache_resource
+def get_analysis_manager():
+    """Shared analysis manager, reused across reruns and sessions"""
+    return AnalysisManager()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_resume_list():
+    """Resume metadata for the manager and analysis tabs; cleared on upload and delete"""
+    return get_resume_db().get_all_resumes()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_resume_stats():
+    """Resume statistics for the manager tab; cleared on upload and delete"""
+    return get_resume_db().get_resume_stats()
+
+def _local_time(ts, fmt):
+    """Format a stored UTC timestamp in the server's local time zone"""
+    return ts.astimezone().strftime(fmt)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_analysis_history(resume_id):
+    """A resume's saved analyses with display timestamps; cleared when new analyses are saved"""
+    analyses = get_analysis_manager().db.get_analyses_for_resume(resume_id)
+    for analysis in analyses:
+        analysis["_ts_fmt"] = _local_time(analysis["analysis_timestamp"], "%Y-%m-%d %H:%M")
+    return analyses
+
+def _invalidate_resume_cache():
+    """Drop cached resume listings after the collection changes"""
+    _cached_resume_list.clear()
+    _cached_resume_stats.clear()
 
-@st.cache_data(ttl=1800)  # Cache for 30 minutes
+@st.cache_data(ttl=1800, show_spinner=False)  # Cache for 30 minutes
 def load_data():
-    """Load data from MongoDB with caching"""
+    """Load data from MongoDB with caching; the last value is the load time, which changes on each reload"""
     try:
-        db = CSClubsDatabase()
-        clubs = db.get_all_clubs()
-        stats = db.get_database_stats()
-        db.close_connection()
+        db = get_db()
+        # The two queries are independent; overlap their round trips on a cold cache
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            clubs_future = executor.submit(db.get_all_clubs)
+            stats_future = executor.submit(db.get_database_stats)
+            clubs, stats = clubs_future.result(), stats_future.result()
         
-        # Clean up freshman-friendliness data
+        # Fill in normalized tags for data loaded before they were stored,
+        # collecting the sidebar filter options in the same pass
+        friendliness_opts = set()
+        recruitment_opts = set()
         for club in clubs:
-            if 'Freshman Friendliness (General Vibe)' in club:
-                value = club['Freshman Friendliness (General Vibe)'].lower()
-                if 'high' in value:
-                    club['Freshman Friendliness (General Vibe)'] = 'High'
-                elif 'medium' in value:
-                    club['Freshman Friendliness (General Vibe)'] = 'Medium'
-                elif 'low' in value:
-                    club['Freshman Friendliness (General Vibe)'] = 'Low'
-                # If none match, leave as is or set to a default value
+            if 'norm_friendliness' not in club:
+                club['norm_friendliness'] = normalize_friendliness(club.get('Freshman Friendliness (General Vibe)'))
+            if 'norm_recruitment' not in club:
+                club['norm_recruitment'] = normalize_recruitment(club.get('Typical Recruitment'))
+            
+            # Display the normalized friendliness level; unmatched values are left as is
+            label = FRIENDLINESS_LABELS.get(club['norm_friendliness'])
+            if label:
+                club['Freshman Friendliness (General Vibe)'] = label
+            
+            if club.get('Freshman Friendliness (General Vibe)'):
+                friendliness_opts.add(club['Freshman Friendliness (General Vibe)'])
+            if club.get('Typical Recruitment'):
+                recruitment_opts.add(RECRUITMENT_LABELS[club['norm_recruitment']])
         
-        return clubs, stats
+        return clubs, stats, sorted(friendliness_opts), sorted(recruitment_opts), time.time()
     except Exception as e:
         st.error(f"Error connecting to database: {str(e)}")
-        return [], {}
+        return [], {}, [], [], 0.0
+
+@st.cache_data(ttl=30)
+def _cached_favorites(user_id):
+    """Load a user's favorites from MongoDB, shared across reruns and sessions"""
+    return frozenset(get_db().get_user_favorites(user_id))
 
 def get_user_favorites():
     """Get user favorites with caching"""
@@ -213,192 +116,224 @@ def get_user_favorites():
         
         # Check if cache is still valid (refresh every 5 minutes for persistent favorites)
         if (current_time - st.session_state.last_favorites_update > 300):
-            db = CSClubsDatabase()
-            st.session_state.favorites_cache = db.get_user_favorites(st.session_state.user_id)
+            st.session_state.favorites_cache = set(_cached_favorites(st.session_state.user_id))
             st.session_state.last_favorites_update = current_time
-            db.close_connection()
         
         return st.session_state.favorites_cache
     except Exception as e:
         st.error(f"Error loading favorites: {str(e)}")
-        return []
+        return set()
 
 def toggle_favorite(club_name):
     """Toggle favorite status of a club"""
     try:
-        db = CSClubsDatabase()
+        now_favorited, success = get_db().toggle_favorite_atomic(st.session_state.user_id, club_name)
+        _cached_favorites.clear()
         
-        if db.is_club_favorited(st.session_state.user_id, club_name):
-            success = db.remove_favorite_club(st.session_state.user_id, club_name)
-            if success and club_name in st.session_state.favorites_cache:
-                st.session_state.favorites_cache.remove(club_name)
+        if success:
+            # Update the local cache from the write result instead of re-reading
+            if now_favorited:
+                st.session_state.favorites_cache.add(club_name)
+            else:
+                st.session_state.favorites_cache.discard(club_name)
         else:
-            success = db.save_favorite_club(st.session_state.user_id, club_name)
-            if success and club_name not in st.session_state.favorites_cache:
-                st.session_state.favorites_cache.append(club_name)
-        
-        db.close_connection()
-        
-        # Force cache refresh
-        st.session_state.last_favorites_update = 0
+            # Force cache refresh
+            st.session_state.last_favorites_update = 0
         
         return success
     except Exception as e:
         st.error(f"Error toggling favorite: {str(e)}")
         return False
 
-def get_friendliness_color_class(friendliness):
-    """Get CSS class for friendliness level"""
-    if not friendliness:
-        return "friendliness-medium"
-    friendliness_lower = friendliness.lower()
-    if "very high" in friendliness_lower:
-        return "friendliness-very-high"
-    elif "high" in friendliness_lower:
-        return "friendliness-high"
-    elif "medium" in friendliness_lower:
-        return "friendliness-medium"
-    else:
-        return "friendliness-low"
+# Display labels for the normalized tags stored on each club
+FRIENDLINESS_LABELS = {
+    "very_high": "Very High",
+    "high": "High",
+    "medium": "Medium",
+    "low": "Low"
+}
 
-def display_club_card(club):
-    """Display a single club in a beautiful card format"""
+RECRUITMENT_LABELS = {
+    "open": "Open Membership",
+    "application": "Application-Based",
+    "invitation": "Invitation Only",
+    "other": "Other"
+}
+
+# CSS class per norm_friendliness tag
+FRIENDLINESS_CSS_CLASSES = {
+    "very_high": "friendliness-very-high",
+    "high": "friendliness-high",
+    "medium": "friendliness-medium",
+    "low": "friendliness-low"
+}
+
+def get_friendliness_color_class(norm_friendliness):
+    """Get CSS class for a normalized friendliness tag"""
+    return FRIENDLINESS_CSS_CLASSES.get(norm_friendliness, "friendliness-medium")
+
+@st.fragment
+def favorite_button(club_name):
+    """Favorite toggle button that reruns only itself when clicked"""
+    is_favorited = club_name in st.session_state.favorites_cache
+    
+    # The callback runs before the fragment reruns, so the icon reflects the new state
+    st.button(
+        "⭐" if is_favorited else "☆",
+        key=f"fav_btn_{club_name.replace(' ', '_')}",
+        help=f"{'Remove from' if is_favorited else 'Add to'} favorites",
+        on_click=toggle_favorite,
+        args=(club_name,)
+    )
+
+def _escape_field(value):
+    """HTML-escape a club field for inline rendering"""
+    # Newlines become <br> so blank lines cannot end the surrounding HTML block
+    return html.escape(str(value)).replace("\n", "<br>")
+
+# Club cards rendered per directory page
+CLUBS_PER_PAGE = 20
+
+def render_club_card_html(club, is_favorited):
+    """Build the full HTML for a club card without calling Streamlit"""
     club_name = club.get("Club Name", "Unknown Club")
-    user_favorites = get_user_favorites()
-    is_favorited = club_name in user_favorites
     
     # Use different CSS class for favorited clubs
     card_class = "favorite-club-card" if is_favorited else "club-card"
-    star_icon = "⭐" if is_favorited else "☆"
-    star_class = "favorite-star" if is_favorited else "non-favorite-star"
-    
-    # Create unique key for the button
-    button_key = f"fav_btn_{club_name.replace(' ', '_')}"
     
-    st.markdown(f"""
+    # Kept inline so a missing acronym cannot leave a blank line in the HTML block
+    acronym_html = f'<div class="club-acronym">{_escape_field(club["Acronym"])}</div>' if club.get("Acronym") else ""
+    header_html = f"""
     <div class="{card_class}">
-        <div class="club-name">{club_name}</div>
-        {f'<div class="club-acronym">{club.get("Acronym", "")}</div>' if club.get("Acronym") else ""}
-    </div>
-    """, unsafe_allow_html=True)
+        <div class="club-name">{_escape_field(club_name)}</div>{acronym_html}
+    </div>"""
+    
+    friendliness = club.get("Freshman Friendliness (General Vibe)", "N/A")
+    color_class = get_friendliness_color_class(club.get("norm_friendliness"))
+    
+    links_html = ""
+    if club.get("Website"):
+        links_html += f'<a href="{html.escape(str(club["Website"]), quote=True)}" target="_blank">🔗 Visit Website</a><br>'
+    if club.get("ApplicationLink"):
+        links_html += f'<a href="{html.escape(str(club["ApplicationLink"]), quote=True)}" target="_blank">📝 Application Link</a><br>'
+    
+    notes_html = ""
+    if club.get("Notes for EECS Freshmen"):
+        notes_html = f"""
+        <div class="field-label">💡 Notes for EECS Freshmen</div>
+        <div class="club-notes">{_escape_field(club["Notes for EECS Freshmen"])}</div>"""
+    
+    card_body_html = f"""
+    <div class="club-card-grid">
+        <div>
+            <div class="field-label">🎯 Primary Focus</div>
+            <div>{_escape_field(club.get("Primary Focus", "N/A"))}</div>
+            <div class="field-label">🚀 Typical Activities</div>
+            <div>{_escape_field(club.get("Typical Activities", "N/A"))}</div>
+            <div class="field-label">📝 How to Join/Learn More</div>
+            <div>{_escape_field(club.get("How to Join/Learn More", "N/A"))}</div>
+            <div class="field-label">👥 Typical Recruitment</div>
+            <div>{_escape_field(club.get("Typical Recruitment", "N/A"))}</div>
+        </div>
+        <div>{links_html}
+            <div class="field-label">📅 Application Time</div>
+            <div>{_escape_field(club.get("Fall Application Time", "N/A"))}</div>
+            <div class="field-label">🎓 Freshman Friendliness</div>
+            <span class="{color_class}">{_escape_field(friendliness)}</span>
+        </div>
+    </div>{notes_html}
+    <hr>
+    """
+    return header_html + card_body_html
+
+def display_club_card(club, user_favorites):
+    """Display a single club in a beautiful card format"""
+    club_name = club.get("Club Name", "Unknown Club")
     
     # Create a column layout for the favorite button
     col_fav, col_content = st.columns([1, 9])
     
     with col_fav:
-        # Favorite toggle button
-        if st.button(star_icon, key=button_key, help=f"{'Remove from' if is_favorited else 'Add to'} favorites"):
-            if toggle_favorite(club_name):
-                st.rerun()
+        favorite_button(club_name)
     
+    # Header and body ship as a single markdown element
     with col_content:
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            # Primary focus
-            st.markdown(f'<div class="field-label">🎯 Primary Focus</div>', unsafe_allow_html=True)
-            st.write(club.get("Primary Focus", "N/A"))
-            
-            # Typical activities
-            st.markdown(f'<div class="field-label">🚀 Typical Activities</div>', unsafe_allow_html=True)
-            st.write(club.get("Typical Activities", "N/A"))
-            
-            # How to join
-            st.markdown(f'<div class="field-label">📝 How to Join/Learn More</div>', unsafe_allow_html=True)
-            st.write(club.get("How to Join/Learn More", "N/A"))
-            
-            # Recruitment info
-            st.markdown(f'<div class="field-label">👥 Typical Recruitment</div>', unsafe_allow_html=True)
-            st.write(club.get("Typical Recruitment", "N/A"))
-        
-        with col2:
-            # Website link
-            if club.get("Website"):
-                st.markdown(f'[🔗 Visit Website]({club["Website"]})')
-            if club.get("ApplicationLink"):
-                st.markdown(f'[📝 Application Link]({club["ApplicationLink"]})')
-                
-            # Application Time
-            st.markdown(f'<div class="field-label">📅 Application Time</div>', unsafe_allow_html=True)
-            st.write(club.get("Fall Application Time", "N/A"))
-            # Freshman friendliness
-            friendliness = club.get("Freshman Friendliness (General Vibe)", "N/A")
-            color_class = get_friendliness_color_class(friendliness)
-            st.markdown(f'<div class="field-label">🎓 Freshman Friendliness</div>', unsafe_allow_html=True)
-            st.markdown(f'<span class="{color_class}">{friendliness}</span>', unsafe_allow_html=True)
-        
-        # Notes for EECS freshmen (full width)
-        if club.get("Notes for EECS Freshmen"):
-            st.markdown(f'<div class="field-label">💡 Notes for EECS Freshmen</div>', unsafe_allow_html=True)
-            st.info(club["Notes for EECS Freshmen"])
+        st.markdown(render_club_card_html(club, club_name in user_favorites), unsafe_allow_html=True)
+
+@st.cache_data(ttl=1800)
+def _build_friendliness_fig(friendliness_counts):
+    """Build the freshman friendliness pie chart from (level, count) pairs"""
+    # Imported here so the Directory tab's first paint does not wait on plotly
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+    
+    fig = go.Figure(go.Pie(
+        labels=[level for level, _ in friendliness_counts],
+        values=[count for _, count in friendliness_counts],
+        marker_colors=qualitative.Set3
+    ))
+    fig.update_layout(
+        title="📊 Freshman Friendliness Distribution",
+        title_font_size=16,
+        title_x=0.5,
+        font=dict(size=12)
+    )
+    return fig
+
+@st.cache_data(ttl=1800)
+def _build_recruitment_fig(recruitment_counts):
+    """Build the recruitment type bar chart from (category, count) pairs"""
+    import plotly.graph_objects as go
     
-    st.markdown("---")
+    counts = [count for _, count in recruitment_counts]
+    fig = go.Figure(go.Bar(
+        x=[category for category, _ in recruitment_counts],
+        y=counts,
+        marker=dict(color=counts, colorscale="Blues")
+    ))
+    fig.update_layout(
+        title="📋 Recruitment Types",
+        title_font_size=16,
+        title_x=0.5,
+        xaxis_title="Recruitment Type",
+        yaxis_title="Number of Clubs",
+        showlegend=False
+    )
+    return fig
 
 def create_analytics_charts(clubs_data):
     """Create analytics charts"""
-    df = pd.DataFrame(clubs_data)
+    # Count categories straight from the club dicts; no DataFrame needed
+    friendliness_counts = Counter(
+        club['Freshman Friendliness (General Vibe)']
+        for club in clubs_data if club.get('Freshman Friendliness (General Vibe)')
+    )
+    recruitment_counts = Counter(
+        RECRUITMENT_LABELS[club['norm_recruitment']]
+        for club in clubs_data if club.get('Typical Recruitment')
+    )
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Freshman friendliness distribution
-        if 'Freshman Friendliness (General Vibe)' in df.columns:
-            friendliness_counts = df['Freshman Friendliness (General Vibe)'].value_counts()
-            
-            fig = px.pie(
-                values=friendliness_counts.values,
-                names=friendliness_counts.index,
-                title="📊 Freshman Friendliness Distribution",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig.update_layout(
-                title_font_size=16,
-                title_x=0.5,
-                font=dict(size=12)
-            )
+        if friendliness_counts:
+            fig = _build_friendliness_fig(tuple(friendliness_counts.most_common()))
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Recruitment type analysis
-        if 'Typical Recruitment' in df.columns:
-            # Categorize recruitment types
-            recruitment_categories = []
-            for recruitment in df['Typical Recruitment'].dropna():
-                if 'open' in recruitment.lower():
-                    recruitment_categories.append('Open Membership')
-                elif 'application' in recruitment.lower():
-                    recruitment_categories.append('Application-Based')
-                elif 'invitation' in recruitment.lower():
-                    recruitment_categories.append('Invitation Only')
-                else:
-                    recruitment_categories.append('Other')
-            
-            if recruitment_categories:
-                recruitment_counts = pd.Series(recruitment_categories).value_counts()
-                
-                fig = px.bar(
-                    x=recruitment_counts.index,
-                    y=recruitment_counts.values,
-                    title="📋 Recruitment Types",
-                    color=recruitment_counts.values,
-                    color_continuous_scale="Blues"
-                )
-                fig.update_layout(
-                    title_font_size=16,
-                    title_x=0.5,
-                    xaxis_title="Recruitment Type",
-                    yaxis_title="Number of Clubs",
-                    showlegend=False
-                )
-                st.plotly_chart(fig, use_container_width=True)
+        if recruitment_counts:
+            fig = _build_recruitment_fig(tuple(recruitment_counts.most_common()))
+            st.plotly_chart(fig, use_container_width=True)
 
-def create_resume_section():
+def create_resume_section(club_options):
     """Create the resume upload and management section"""
     st.markdown("### 📄 Resume Management")
     st.markdown("Upload and manage your resumes for club applications")
     
     # Initialize database
-    resume_db = ResumeDatabase()
+    resume_db = get_resume_db()
     
     # Create tabs for upload and view
     upload_tab, view_tab = st.tabs(["📤 Upload Resume", "📋 View Resumes"])
@@ -430,36 +365,35 @@ def create_resume_section():
                     uploaded_file.seek(0)
                     
                     # Save to database
-                    resume_id = resume_db.save_resume(
+                    resume_id, extracted_text = resume_db.save_resume(
                         filename=uploaded_file.name,
                         file_content=uploaded_file,
                         file_type="pdf"
                     )
                     
                     if resume_id:
+                        _invalidate_resume_cache()
                         st.success(f"✅ Resume uploaded successfully!")
                         st.balloons()
                         
-                        # Show preview
-                        resume = resume_db.get_resume_by_id(resume_id)
-                        if resume:
-                            st.markdown("#### Preview")
-                            preview_text = resume["text_content"][:500] + "..." if len(resume["text_content"]) > 500 else resume["text_content"]
-                            st.text_area("Resume Content Preview", preview_text, height=150)
+                        # Show preview from the text we just extracted; no round trip needed
+                        st.markdown("#### Preview")
+                        preview_text = extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text
+                        st.text_area("Resume Content Preview", preview_text, height=150)
                     else:
                         st.error("❌ Failed to upload resume. Please try again.")
     
     with view_tab:
         st.markdown("#### Your Uploaded Resumes")
         
-        # Get all resumes
-        resumes = resume_db.get_all_resumes()
+        # Get all resumes (metadata only; text is loaded on demand)
+        resumes = _cached_resume_list()
         
         if not resumes:
             st.info("📝 No resumes uploaded yet. Upload your first resume in the Upload tab!")
         else:
             # Display statistics
-            stats = resume_db.get_resume_stats()
+            stats = _cached_resume_stats()
             col1, col2 = st.columns(2)
             with col1:
                 st.metric("Total Resumes", stats["total_resumes"])
@@ -468,114 +402,108 @@ def create_resume_section():
             
             st.markdown("---")
             
+            # Fetch analysis summaries for every resume in one query
+            try:
+                analysis_summaries = get_analysis_manager().get_summaries_for_resumes(
+                    [str(resume['_id']) for resume in resumes]
+                )
+            except Exception:
+                analysis_summaries = {}  # Ignore if analysis manager is not available
+            
+            club_option_names = list(club_options.keys())
+            
             # Display each resume
             for resume in resumes:
-                with st.expander(f"📄 {resume['filename']} - {resume['upload_timestamp'].strftime('%Y-%m-%d %H:%M')}"):
-                    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+                with st.expander(f"📄 {resume['filename']} - {_local_time(resume['upload_timestamp'], '%Y-%m-%d %H:%M')}"):
+                    col1, col2, col3 = st.columns([2, 1, 1])
                     
                     with col1:
                         st.write(f"**Word Count:** {resume.get('word_count', 'N/A')}")
                         st.write(f"**Character Count:** {resume.get('character_count', 'N/A')}")
-                        st.write(f"**Upload Date:** {resume['upload_timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
+                        st.write(f"**Upload Date:** {_local_time(resume['upload_timestamp'], '%Y-%m-%d %H:%M:%S')}")
                         
                         # Show analysis summary if available
-                        try:
-                            from analysis_manager import AnalysisManager
-                            temp_analysis_manager = AnalysisManager()
-                            analysis_summary = temp_analysis_manager.get_resume_analysis_summary(str(resume['_id']))
-                            if analysis_summary["count"] > 0:
-                                st.write(f"**Analyses:** {analysis_summary['count']}")
-                                st.write(f"**Top Match:** {analysis_summary['top_club']} ({analysis_summary['top_score']})")
-                            temp_analysis_manager.close_connection()
-                        except Exception:
-                            pass  # Ignore if analysis manager is not available
+                        analysis_summary = analysis_summaries.get(str(resume['_id']))
+                        if analysis_summary:
+                            st.write(f"**Analyses:** {analysis_summary['count']}")
+                            st.write(f"**Top Match:** {analysis_summary['top_club']} ({analysis_summary['top_score']})")
                     
                     with col2:
                         if st.button(f"👁️ View", key=f"view_{resume['_id']}"):
                             st.text_area(
                                 "Resume Content",
-                                resume["text_content"],
+                                resume_db.get_resume_text(resume['_id']),
                                 height=300,
                                 key=f"content_{resume['_id']}"
                             )
+                            if resume.get("file_id"):
+                                file_bytes = resume_db.get_resume_file(resume["file_id"])
+                                if file_bytes:
+                                    st.download_button(
+                                        "📥 Download PDF",
+                                        data=file_bytes,
+                                        file_name=resume["filename"],
+                                        mime="application/pdf",
+                                        key=f"download_{resume['_id']}"
+                                    )
                     
                     with col3:
-                        if st.button(f"🤖 Quick Analysis", key=f"analyze_{resume['_id']}", type="primary"):
-                            st.session_state[f"show_analysis_{resume['_id']}"] = True
-                    
-                    with col4:
                         if st.button(f"🗑️ Delete", key=f"delete_{resume['_id']}", type="secondary"):
                             if resume_db.delete_resume(resume['_id']):
+                                _invalidate_resume_cache()
                                 st.success("Resume deleted!")
                                 st.rerun()
                             else:
                                 st.error("Failed to delete resume")
                     
-                    # Show quick analysis interface if requested
-                    if st.session_state.get(f"show_analysis_{resume['_id']}", False):
-                        st.markdown("---")
-                        st.markdown("##### Quick Analysis")
+                    # Quick analysis renders in place, without a rerun
+                    st.markdown("---")
+                    st.markdown("##### Quick Analysis")
+                    
+                    if club_options:
+                        selected_club_name = st.selectbox(
+                            "Select Club for Analysis:", 
+                            club_option_names, 
+                            key=f"club_select_{resume['_id']}"
+                        )
+                        
+                        analyze_clicked = st.button(f"🤖 Quick Analysis", key=f"analyze_{resume['_id']}", type="primary")
+                        result_slot = st.empty()
                         
-                        # Get clubs data for selection
-                        try:
-                            db = CSClubsDatabase()
-                            clubs_data = db.get_all_clubs()
-                            db.close_connection()
-                            
-                            if clubs_data:
-                                club_options = {club.get("Club Name", "Unknown"): club for club in clubs_data}
-                                selected_club_name = st.selectbox(
-                                    "Select Club for Analysis:", 
-                                    list(club_options.keys()), 
-                                    key=f"club_select_{resume['_id']}"
-                                )
+                        if analyze_clicked:
+                            with result_slot.container():
+                                selected_club = club_options[selected_club_name]
                                 
-                                quick_col1, quick_col2 = st.columns(2)
-                                with quick_col1:
-                                    if st.button(f"🔍 Analyze", key=f"run_analysis_{resume['_id']}", type="primary"):
-                                        selected_club = club_options[selected_club_name]
-                                        
-                                        # Initialize analysis manager
-                                        analysis_manager = AnalysisManager()
-                                        
-                                        if analysis_manager.analyzer.is_configured():
-                                            with st.spinner("Analyzing resume..."):
-                                                analysis_result = analysis_manager.analyze_resume_for_club(
-                                                    resume_id=str(resume["_id"]),
-                                                    resume_text=resume["text_content"],
-                                                    club_data=selected_club,
-                                                    force_refresh=False
-                                                )
-                                                
-                                                if analysis_result:
-                                                    st.success(f"Analysis completed! Match Score: {analysis_result.match_score}/100")
-                                                    st.info("View full analysis in the Resume Analysis tab.")
-                                                else:
-                                                    st.error("Analysis failed. Please try again.")
-                                        else:
-                                            st.warning("LLM not configured. Please set up API keys in .env file.")
-                                        
-                                        analysis_manager.close_connection()
+                                # Initialize analysis manager
+                                analysis_manager = get_analysis_manager()
                                 
-                                with quick_col2:
-                                    if st.button(f"❌ Cancel", key=f"cancel_analysis_{resume['_id']}"):
-                                        st.session_state[f"show_analysis_{resume['_id']}"] = False
-                                        st.rerun()
-                            else:
-                                st.warning("No clubs data available for analysis.")
-                        except Exception as e:
-                            st.error(f"Error loading clubs data: {str(e)}")
-    
-    # Close database connection
-    resume_db.close_connection()
+                                if analysis_manager.analyzer.is_configured():
+                                    with st.spinner("Analyzing resume..."):
+                                        analysis_result = analysis_manager.analyze_resume_for_club(
+                                            resume_id=str(resume["_id"]),
+                                            resume_text=resume_db.get_resume_text(resume['_id']),
+                                            club_data=selected_club,
+                                            force_refresh=False
+                                        )
+                                    _cached_analysis_history.clear()
+                                    
+                                    if analysis_result:
+                                        st.success(f"Analysis completed! Match Score: {analysis_result.match_score}/100")
+                                        st.info("View full analysis in the Resume Analysis tab.")
+                                    else:
+                                        st.error("Analysis failed. Please try again.")
+                                else:
+                                    st.warning("LLM not configured. Please set up API keys in .env file.")
+                    else:
+                        st.warning("No clubs data available for analysis.")
 
-def create_resume_analysis_section(clubs_data):
+def create_resume_analysis_section(clubs_data, club_options):
     """Create the resume analysis section with LLM-powered insights"""
     st.markdown("### 🤖 Resume Analysis")
     st.markdown("Get AI-powered insights on how well your resume matches specific clubs")
     
     # Initialize analysis manager
-    analysis_manager = AnalysisManager()
+    analysis_manager = get_analysis_manager()
     
     # Check if LLM is configured
     if not analysis_manager.analyzer.is_configured():
@@ -589,14 +517,17 @@ def create_resume_analysis_section(clubs_data):
         return
     
     # Get available resumes
-    resume_db = ResumeDatabase()
-    resumes = resume_db.get_all_resumes()
+    resume_db = get_resume_db()
+    resumes = _cached_resume_list()
     
     if not resumes:
         st.info("📝 No resumes found. Please upload a resume in the Resume Manager tab first.")
-        resume_db.close_connection()
         return
     
+    # Resume options shared by every tab
+    resume_options = {f"{resume['filename']} ({_local_time(resume['upload_timestamp'], '%Y-%m-%d')})": resume for resume in resumes}
+    resume_option_keys = list(resume_options)
+    
     # Create analysis interface
     analysis_tab, comparison_tab, history_tab = st.tabs(["🔍 Single Analysis", "📊 Compare Clubs", "📈 Analysis History"])
     
@@ -604,12 +535,10 @@ def create_resume_analysis_section(clubs_data):
         st.markdown("#### Analyze Resume for Specific Club")
         
         # Resume selection
-        resume_options = {f"{resume['filename']} ({resume['upload_timestamp'].strftime('%Y-%m-%d')})": resume for resume in resumes}
-        selected_resume_key = st.selectbox("Select Resume:", list(resume_options.keys()))
+        selected_resume_key = st.selectbox("Select Resume:", resume_option_keys)
         selected_resume = resume_options[selected_resume_key]
         
         # Club selection
-        club_options = {club.get("Club Name", "Unknown"): club for club in clubs_data}
         selected_club_name = st.selectbox("Select Club:", list(club_options.keys()))
         selected_club = club_options[selected_club_name]
         
@@ -622,10 +551,11 @@ def create_resume_analysis_section(clubs_data):
                 with st.spinner("Analyzing resume..."):
                     analysis_result = analysis_manager.analyze_resume_for_club(
                         resume_id=str(selected_resume["_id"]),
-                        resume_text=selected_resume["text_content"],
+                        resume_text=resume_db.get_resume_text(selected_resume["_id"]),
                         club_data=selected_club,
                         force_refresh=force_refresh
                     )
+                    _cached_analysis_history.clear()
                     
                     if analysis_result:
                         display_analysis_result(analysis_result, selected_club_name)
@@ -636,7 +566,7 @@ def create_resume_analysis_section(clubs_data):
         st.markdown("#### Compare Resume Against Multiple Clubs")
         
         # Resume selection
-        selected_resume_key = st.selectbox("Select Resume:", list(resume_options.keys()), key="compare_resume")
+        selected_resume_key = st.selectbox("Select Resume:", resume_option_keys, key="compare_resume")
         selected_resume = resume_options[selected_resume_key]
         
         # Club selection
@@ -644,7 +574,8 @@ def create_resume_analysis_section(clubs_data):
         
         # Get user favorites for default selection
         user_favorites_for_comparison = get_user_favorites()
-        available_favorites = [name for name in user_favorites_for_comparison if name in club_names]
+        # Favorites are a set, so walk club_names for O(C) lookups in a stable order
+        available_favorites = [name for name in club_names if name in user_favorites_for_comparison]
         
         # Determine default selection: favorites if available, otherwise first 3 clubs
         if available_favorites:
@@ -663,7 +594,8 @@ def create_resume_analysis_section(clubs_data):
         )
         
         if selected_club_names:
-            selected_clubs = [club for club in clubs_data if club.get("Club Name") in selected_club_names]
+            selected_club_name_set = set(selected_club_names)
+            selected_clubs = [club for club in clubs_data if club.get("Club Name") in selected_club_name_set]
             
             col1, col2 = st.columns(2)
             with col1:
@@ -673,25 +605,63 @@ def create_resume_analysis_section(clubs_data):
                     with st.spinner("Analyzing resume against multiple clubs..."):
                         comparison_result = analysis_manager.analyze_resume_for_multiple_clubs(
                             resume_id=str(selected_resume["_id"]),
-                            resume_text=selected_resume["text_content"],
+                            resume_text=resume_db.get_resume_text(selected_resume["_id"]),
                             clubs_data=selected_clubs,
                             force_refresh=force_refresh
                         )
+                        _cached_analysis_history.clear()
                         
                         if comparison_result["analyses"]:
                             display_comparison_results(comparison_result)
                         else:
                             st.error("Comparison analysis failed. Please try again.")
+                
+                # The batch API is cheaper but may take up to 24 hours; results are collected on demand
+                if st.button("🕒 Submit as Batch", help="Queue these analyses on the provider's batch API"):
+                    batch_id = analysis_manager.submit_batch_analysis(
+                        resume_db.get_resume_text(selected_resume["_id"]),
+                        selected_clubs
+                    )
+                    if batch_id:
+                        st.session_state.compare_batch = {
+                            "batch_id": batch_id,
+                            "resume_id": str(selected_resume["_id"]),
+                            "club_names": [club.get("Club Name", "Unknown Club") for club in selected_clubs]
+                        }
+        
+        pending_batch = st.session_state.get("compare_batch")
+        if pending_batch:
+            st.info(f"Batch {pending_batch['batch_id']} submitted for {len(pending_batch['club_names'])} clubs")
+            if st.button("🔄 Check Batch"):
+                try:
+                    done, total, comparison_result = analysis_manager.collect_batch_analysis(
+                        pending_batch["resume_id"],
+                        pending_batch["batch_id"],
+                        pending_batch["club_names"]
+                    )
+                except BatchFailedError as e:
+                    st.error(f"Batch failed: {str(e)}")
+                    del st.session_state.compare_batch
+                except Exception as e:
+                    # Transient provider errors leave the batch queued for the next check
+                    st.error(f"Could not check batch: {str(e)}")
+                else:
+                    if comparison_result is None:
+                        st.progress(done / total if total else 0.0, text=f"{done}/{total} analyses finished")
+                    else:
+                        del st.session_state.compare_batch
+                        _cached_analysis_history.clear()
+                        display_comparison_results(comparison_result)
     
     with history_tab:
         st.markdown("#### Analysis History")
         
         # Resume selection for history
-        selected_resume_key = st.selectbox("Select Resume:", list(resume_options.keys()), key="history_resume")
+        selected_resume_key = st.selectbox("Select Resume:", resume_option_keys, key="history_resume")
         selected_resume = resume_options[selected_resume_key]
         
-        # Get analysis history
-        analyses = analysis_manager.db.get_analyses_for_resume(str(selected_resume["_id"]))
+        # Get analysis history (formatted once per cache fill, not on every rerun)
+        analyses = _cached_analysis_history(str(selected_resume["_id"]))
         
         if analyses:
             st.success(f"Found {len(analyses)} previous analyses")
@@ -717,20 +687,19 @@ def create_resume_analysis_section(clubs_data):
                 st.download_button(
                     label="Download Analysis History (JSON)",
                     data=export_data,
-                    file_name=f"resume_analysis_{selected_resume['filename']}_{selected_resume['upload_timestamp'].strftime('%Y%m%d')}.json",
+                    file_name=f"resume_analysis_{selected_resume['filename']}_{_local_time(selected_resume['upload_timestamp'], '%Y%m%d')}.json",
                     mime="application/json"
                 )
         else:
             st.info("No analysis history found for this resume.")
-    
-    # Close database connections
-    resume_db.close_connection()
-    analysis_manager.close_connection()
 
-def display_analysis_result(analysis_result, club_name):
-    """Display a single analysis result"""
-    st.markdown(f"#### Analysis Results for {club_name}")
-    
+def _bullet_markdown(heading, items):
+    """Format a heading and its items as one markdown block"""
+    return "\n\n".join([heading] + [f"• {item}" for item in items])
+
+@st.cache_data(max_entries=256)
+def _format_analysis_result(analysis_result):
+    """Build the markdown for an analysis once; results are immutable"""
     # Match score with color coding
     score = analysis_result.match_score
     if score >= 80:
@@ -740,7 +709,25 @@ def display_analysis_result(analysis_result, club_name):
     else:
         score_color = "red"
     
-    st.markdown(f"**Match Score:** <span style='color:{score_color}; font-size:24px; font-weight:bold'>{score}/100</span>", unsafe_allow_html=True)
+    return {
+        "score": f"**Match Score:** <span style='color:{score_color}; font-size:24px; font-weight:bold'>{score}/100</span>",
+        "left": "\n\n".join([
+            _bullet_markdown("#### 🤝 Networking Strategy", analysis_result.networking_strategy),
+            _bullet_markdown("#### 🏫 Campus Resources", analysis_result.campus_resources)
+        ]),
+        "right": "\n\n".join([
+            _bullet_markdown("#### 📅 Application Timeline", analysis_result.application_timeline),
+            _bullet_markdown("#### 🎯 Preparation Steps", analysis_result.preparation_steps)
+        ]),
+        "improvements": _bullet_markdown("#### 📈 Resume Improvements", analysis_result.improvements)
+    }
+
+def display_analysis_result(analysis_result, club_name):
+    """Display a single analysis result"""
+    st.markdown(f"#### Analysis Results for {club_name}")
+    
+    formatted = _format_analysis_result(analysis_result)
+    st.markdown(formatted["score"], unsafe_allow_html=True)
     
     # Strategy summary
     if analysis_result.strategy_summary:
@@ -750,27 +737,37 @@ def display_analysis_result(analysis_result, club_name):
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("#### 🤝 Networking Strategy")
-        for strategy in analysis_result.networking_strategy:
-            st.markdown(f"• {strategy}")
-        
-        st.markdown("#### 🏫 Campus Resources")
-        for resource in analysis_result.campus_resources:
-            st.markdown(f"• {resource}")
+        st.markdown(formatted["left"])
     
     with col2:
-        st.markdown("#### 📅 Application Timeline")
-        for timeline in analysis_result.application_timeline:
-            st.markdown(f"• {timeline}")
-        
-        st.markdown("#### 🎯 Preparation Steps")
-        for step in analysis_result.preparation_steps:
-            st.markdown(f"• {step}")
+        st.markdown(formatted["right"])
     
     # Resume improvements section (full width)
-    st.markdown("#### 📈 Resume Improvements")
-    for improvement in analysis_result.improvements:
-        st.markdown(f"• {improvement}")
+    st.markdown(formatted["improvements"])
+
+@st.cache_resource(max_entries=32)
+def _build_comparison_fig(club_names, match_scores):
+    """Build the match score bar chart for a club comparison"""
+    import numpy as np
+    import plotly.express as px
+    
+    scores = np.asarray(match_scores, dtype=np.int16)
+    bar_colors = np.where(scores >= 80, 'green', np.where(scores >= 60, 'orange', 'red'))
+    
+    # Bar chart of match scores on a lightweight template
+    fig = px.bar(
+        x=np.asarray(club_names, dtype=object),
+        y=scores,
+        text=scores,
+        color=bar_colors,
+        color_discrete_map={"green": "green", "orange": "orange", "red": "red"},
+        template="simple_white",
+        labels={"x": "Club", "y": "Match Score"},
+        title="Match Scores by Club",
+        range_y=[0, 100]
+    )
+    fig.update_traces(textposition='auto', showlegend=False)
+    return fig
 
 def display_comparison_results(comparison_result):
     """Display comparison results for multiple clubs"""
@@ -779,29 +776,14 @@ def display_comparison_results(comparison_result):
     analyses = comparison_result["analyses"]
     
     # Create a summary chart
-    club_names = [analysis[0] for analysis in analyses]
-    match_scores = [analysis[1].match_score for analysis in analyses]
-    
-    # Bar chart of match scores
-    import plotly.graph_objects as go
-    fig = go.Figure(data=[
-        go.Bar(
-            x=club_names,
-            y=match_scores,
-            text=match_scores,
-            textposition='auto',
-            marker_color=['green' if score >= 80 else 'orange' if score >= 60 else 'red' for score in match_scores]
-        )
-    ])
-    
-    fig.update_layout(
-        title="Match Scores by Club",
-        xaxis_title="Club",
-        yaxis_title="Match Score",
-        yaxis=dict(range=[0, 100])
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    club_names = tuple(club_name for club_name, _ in analyses)
+    match_scores = tuple(analysis.match_score for _, analysis in analyses)
+    if len(analyses) <= 1:
+        # A chart adds nothing for a single club; show a plain table instead
+        st.dataframe({"Club": club_names, "Match Score": match_scores}, hide_index=True)
+    else:
+        fig = _build_comparison_fig(club_names, match_scores)
+        st.plotly_chart(fig, use_container_width=True)
     
     # Display top matches
     st.markdown("#### 🏆 Top Matches")
@@ -809,60 +791,107 @@ def display_comparison_results(comparison_result):
         with st.expander(f"#{i+1} {club_name} (Score: {analysis.match_score})"):
             display_analysis_result(analysis, club_name)
 
+# Sections stored by older versions of the analyzer
+LEGACY_ANALYSIS_SECTIONS = (
+    ("strengths", "**✅ Strengths (Legacy):**"),
+    ("key_experiences", "**🔧 Key Experiences (Legacy):**"),
+    ("tailoring_suggestions", "**🎯 Tailoring Suggestions (Legacy):**")
+)
+
 def display_historical_analysis(analysis):
     """Display a historical analysis in an expandable format"""
     club_name = analysis["club_name"]
     match_score = analysis["match_score"]
-    timestamp = analysis["analysis_timestamp"].strftime("%Y-%m-%d %H:%M")
+    timestamp = analysis["_ts_fmt"]
     
     with st.expander(f"{club_name} - Score: {match_score} ({timestamp})"):
         # Strategy summary
-        if "strategy_summary" in analysis:
-            st.info(f"**Strategy:** {analysis['strategy_summary']}")
+        strategy_summary = analysis.get("strategy_summary")
+        if strategy_summary:
+            st.info(f"**Strategy:** {strategy_summary}")
         
         col1, col2 = st.columns(2)
         
         with col1:
-            if "networking_strategy" in analysis:
-                st.markdown("**🤝 Networking Strategy:**")
-                for strategy in analysis["networking_strategy"]:
-                    st.markdown(f"• {strategy}")
+            networking_strategy = analysis.get("networking_strategy")
+            if networking_strategy:
+                st.markdown(_bullet_markdown("**🤝 Networking Strategy:**", networking_strategy))
             
-            if "campus_resources" in analysis:
-                st.markdown("**🏫 Campus Resources:**")
-                for resource in analysis["campus_resources"]:
-                    st.markdown(f"• {resource}")
+            campus_resources = analysis.get("campus_resources")
+            if campus_resources:
+                st.markdown(_bullet_markdown("**🏫 Campus Resources:**", campus_resources))
         
         with col2:
-            if "application_timeline" in analysis:
-                st.markdown("**📅 Application Timeline:**")
-                for timeline in analysis["application_timeline"]:
-                    st.markdown(f"• {timeline}")
+            application_timeline = analysis.get("application_timeline")
+            if application_timeline:
+                st.markdown(_bullet_markdown("**📅 Application Timeline:**", application_timeline))
             
-            if "preparation_steps" in analysis:
-                st.markdown("**🎯 Preparation Steps:**")
-                for step in analysis["preparation_steps"]:
-                    st.markdown(f"• {step}")
+            preparation_steps = analysis.get("preparation_steps")
+            if preparation_steps:
+                st.markdown(_bullet_markdown("**🎯 Preparation Steps:**", preparation_steps))
         
         # Resume improvements (full width)
-        if "improvements" in analysis:
-            st.markdown("**📈 Resume Improvements:**")
-            for improvement in analysis["improvements"]:
-                st.markdown(f"• {improvement}")
+        improvements = analysis.get("improvements")
+        if improvements:
+            st.markdown(_bullet_markdown("**📈 Resume Improvements:**", improvements))
         
         # Backward compatibility for old analyses
-        if "strengths" in analysis:
-            st.markdown("**✅ Strengths (Legacy):**")
-            for strength in analysis["strengths"]:
-                st.markdown(f"• {strength}")
-        if "key_experiences" in analysis:
-            st.markdown("**🔧 Key Experiences (Legacy):**")
-            for experience in analysis["key_experiences"]:
-                st.markdown(f"• {experience}")
-        if "tailoring_suggestions" in analysis:
-            st.markdown("**🎯 Tailoring Suggestions (Legacy):**")
-            for suggestion in analysis["tailoring_suggestions"]:
-                st.markdown(f"• {suggestion}")
+        for key, heading in LEGACY_ANALYSIS_SECTIONS:
+            items = analysis.get(key)
+            if items:
+                st.markdown(_bullet_markdown(heading, items))
+
+ClubIndex = namedtuple("ClubIndex", [
+    "friendliness",
+    "name_lc", "acronym_lc", "focus_lc", "recruit_lc",
+    "open_mask", "app_mask", "high_friendly_mask", "website_mask"
+])
+
+@st.cache_data(ttl=1800)
+def _index_clubs(clubs_data):
+    """Index lowercased search fields and metric masks in one pass"""
+    friendliness = []
+    name_lc, acronym_lc, focus_lc, recruit_lc = [], [], [], []
+    open_mask, app_mask, high_friendly_mask, website_mask = [], [], [], []
+    
+    for club in clubs_data:
+        level = club.get("Freshman Friendliness (General Vibe)", "N/A")
+        recruitment = club.get("Typical Recruitment", "")
+        recruit_tag = club["norm_recruitment"]
+        
+        friendliness.append(level)
+        name_lc.append(club.get("Club Name", "").lower())
+        acronym_lc.append(club.get("Acronym", "").lower())
+        focus_lc.append(club.get("Primary Focus", "").lower())
+        recruit_lc.append(recruitment.lower())
+        open_mask.append(recruit_tag == "open")
+        app_mask.append(recruit_tag == "application")
+        high_friendly_mask.append(club["norm_friendliness"] in ("very_high", "high"))
+        website_mask.append(bool(club.get("Website")))
+    
+    return ClubIndex(
+        friendliness,
+        name_lc, acronym_lc, focus_lc, recruit_lc,
+        tuple(open_mask), tuple(app_mask), tuple(high_friendly_mask), tuple(website_mask)
+    )
+
+def _analytics_tab(clubs_data, club_index):
+    """Render the analytics tab from the club index and cached figures"""
+    st.markdown("### Analytics Dashboard")
+    create_analytics_charts(clubs_data)
+    
+    # Additional stats
+    st.markdown("### 📈 Quick Stats")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Open Membership Clubs", sum(club_index.open_mask))
+    
+    with col2:
+        st.metric("Application-Based Clubs", sum(club_index.app_mask))
+    
+    with col3:
+        st.metric("Clubs with Websites", sum(club_index.website_mask))
 
 def main():
     # Initialize session state for favorites using a persistent user ID
@@ -871,7 +900,7 @@ def main():
         st.session_state.user_id = "default_user"
     
     if 'favorites_cache' not in st.session_state:
-        st.session_state.favorites_cache = []
+        st.session_state.favorites_cache = set()
     
     if 'last_favorites_update' not in st.session_state:
         st.session_state.last_favorites_update = 0
@@ -881,7 +910,7 @@ def main():
     st.markdown('<p class="sub-header">Discover the perfect Computer Science club for your journey!</p>', unsafe_allow_html=True)
     
     # Load data
-    clubs_data, db_stats = load_data()
+    clubs_data, db_stats, friendliness_opts, recruitment_opts, loaded_at = load_data()
     
     if not clubs_data:
         st.error("🚨 No data available. Please check your database connection.")
@@ -910,48 +939,45 @@ def main():
         placeholder="Enter club name, acronym, or focus area..."
     )
     
+    # Index the clubs once; filters and metrics below reuse it
+    club_index = _index_clubs(clubs_data)
+    
     # Freshman friendliness filter
-    friendliness_options = ["All Levels"] + sorted(list(set([
-        club.get("Freshman Friendliness (General Vibe)", "N/A") 
-        for club in clubs_data if club.get("Freshman Friendliness (General Vibe)")
-    ])))
+    friendliness_options = ["All Levels"] + friendliness_opts
     selected_friendliness = st.sidebar.selectbox("🎓 Freshman Friendliness:", friendliness_options)
     
     # Recruitment type filter
-    recruitment_types = ["All Types"] + sorted(list(set([
-        "Open Membership" if "open" in club.get("Typical Recruitment", "").lower()
-        else "Application-Based" if "application" in club.get("Typical Recruitment", "").lower()
-        else "Invitation Only" if "invitation" in club.get("Typical Recruitment", "").lower()
-        else "Other"
-        for club in clubs_data if club.get("Typical Recruitment")
-    ])))
+    recruitment_types = ["All Types"] + recruitment_opts
     selected_recruitment = st.sidebar.selectbox("📝 Recruitment Type:", recruitment_types)
     
-    # Filter clubs based on search and filters
-    filtered_clubs = clubs_data.copy()
-    
-    if search_term:
-        filtered_clubs = [
-            club for club in filtered_clubs 
-            if (search_term.lower() in club.get("Club Name", "").lower() or
-                search_term.lower() in club.get("Acronym", "").lower() or
-                search_term.lower() in club.get("Primary Focus", "").lower() or
-                search_term.lower() in club.get("Typical Recruitment", "").lower())
-        ]
-    
-    if selected_friendliness != "All Levels":
-        filtered_clubs = [
-            club for club in filtered_clubs 
-            if club.get("Freshman Friendliness (General Vibe)", "N/A") == selected_friendliness
-        ]
-    
-    if selected_recruitment != "All Types":
-        filtered_clubs = [
-            club for club in filtered_clubs 
-            if ((selected_recruitment == "Open Membership" and "open" in club.get("Typical Recruitment", "").lower()) or
-                (selected_recruitment == "Application-Based" and "application" in club.get("Typical Recruitment", "").lower()) or
-                (selected_recruitment == "Invitation Only" and "invitation" in club.get("Typical Recruitment", "").lower()))
-        ]
+    # Filter clubs based on search and filters in a single pass
+    active = bool(search_term) or selected_friendliness != "All Levels" or selected_recruitment != "All Types"
+    
+    # Reruns triggered by other widgets reuse the last match list; the load time
+    # invalidates it when load_data refreshes, even if the row count is unchanged
+    s = search_term.lower()
+    filter_key = (s, selected_friendliness, selected_recruitment, loaded_at)
+    cached_filter = st.session_state.get('filter_cache')
+    
+    if not active:
+        filtered_clubs = clubs_data
+    elif cached_filter and cached_filter[0] == filter_key:
+        filtered_clubs = [clubs_data[i] for i in cached_filter[1]]
+    else:
+        
+        def predicate(i, club):
+            if s and not (s in club_index.name_lc[i] or s in club_index.acronym_lc[i] or
+                          s in club_index.focus_lc[i] or s in club_index.recruit_lc[i]):
+                return False
+            if selected_friendliness != "All Levels" and club_index.friendliness[i] != selected_friendliness:
+                return False
+            if selected_recruitment != "All Types" and RECRUITMENT_LABELS[club["norm_recruitment"]] != selected_recruitment:
+                return False
+            return True
+        
+        matches = [i for i, club in enumerate(clubs_data) if predicate(i, club)]
+        st.session_state.filter_cache = (filter_key, matches)
+        filtered_clubs = [clubs_data[i] for i in matches]
     
     # Display statistics
     col1, col2, col3 = st.columns(3)
@@ -960,11 +986,10 @@ def main():
     with col2:
         st.metric("🔍 Filtered Results", len(filtered_clubs))
     with col3:
-        high_friendliness = len([
-            c for c in clubs_data 
-            if "high" in c.get("Freshman Friendliness (General Vibe)", "").lower()
-        ])
-        st.metric("🎓 Freshman-Friendly", high_friendliness)
+        st.metric("🎓 Freshman-Friendly", sum(club_index.high_friendly_mask))
+    
+    # Club lookup by name, built once per rerun and shared by the resume tabs
+    club_options = {club.get("Club Name", "Unknown"): club for club in clubs_data}
     
     # Tabs for different views
     tab1, tab2, tab3, tab4 = st.tabs(["📋 Club Directory", "📊 Analytics", "📄 Resume Manager", "🤖 Resume Analysis"])
@@ -973,60 +998,40 @@ def main():
         st.markdown("### Club Directory")
         
         if filtered_clubs:
-            # Sort clubs: favorited clubs first, then alphabetical
-            favorited_clubs = []
-            non_favorited_clubs = []
-            
-            for club in filtered_clubs:
-                club_name = club.get("Club Name", "Unknown Club")
-                if club_name in user_favorites:
-                    favorited_clubs.append(club)
-                else:
-                    non_favorited_clubs.append(club)
+            # Sort clubs once: favorited clubs first, then alphabetical
+            fav_set = frozenset(user_favorites)
+            sorted_clubs = sorted(filtered_clubs, key=lambda c: (c.get("Club Name", "Unknown Club") not in fav_set, c.get("Club Name", "")))
             
-            # Sort each group alphabetically
-            favorited_clubs.sort(key=lambda x: x.get("Club Name", ""))
-            non_favorited_clubs.sort(key=lambda x: x.get("Club Name", ""))
+            # Render one page of cards so rerun cost does not grow with the directory
+            total_pages = (len(sorted_clubs) + CLUBS_PER_PAGE - 1) // CLUBS_PER_PAGE
+            page = 1
+            if total_pages > 1:
+                page = min(st.sidebar.number_input("📄 Directory page:", min_value=1, value=1, step=1), total_pages)
+                st.caption(f"Page {page} of {total_pages} ({len(sorted_clubs)} clubs)")
+            page_clubs = sorted_clubs[(page - 1) * CLUBS_PER_PAGE:page * CLUBS_PER_PAGE]
             
-            # Display favorited clubs first
-            if favorited_clubs:
-                st.markdown("### ⭐ Your Favorite Clubs")
-                for club in favorited_clubs:
-                    display_club_card(club)
-                
-                if non_favorited_clubs:
+            # Favorites lead the sorted list; emit the separator where they end
+            showing_favorites = False
+            for club in page_clubs:
+                is_favorite = club.get("Club Name", "Unknown Club") in fav_set
+                if is_favorite and not showing_favorites:
+                    st.markdown("### ⭐ Your Favorite Clubs")
+                    showing_favorites = True
+                elif not is_favorite and showing_favorites:
                     st.markdown('<div class="favorites-separator"><span>Other Clubs</span></div>', unsafe_allow_html=True)
-            
-            # Display non-favorited clubs
-            for club in non_favorited_clubs:
-                display_club_card(club)
+                    showing_favorites = False
+                display_club_card(club, user_favorites)
         else:
             st.info("🔍 No clubs match your current filters. Try adjusting your search criteria.")
     
     with tab2:
-        st.markdown("### Analytics Dashboard")
-        create_analytics_charts(clubs_data)
-        
-        # Additional stats
-        st.markdown("### 📈 Quick Stats")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            open_clubs = len([c for c in clubs_data if "open" in c.get("Typical Recruitment", "").lower()])
-            st.metric("Open Membership Clubs", open_clubs)
-        
-        with col2:
-            app_clubs = len([c for c in clubs_data if "application" in c.get("Typical Recruitment", "").lower()])
-            st.metric("Application-Based Clubs", app_clubs)
-        
-        with col3:
-            clubs_with_websites = len([c for c in clubs_data if c.get("Website")])
-            st.metric("Clubs with Websites", clubs_with_websites)
+        _analytics_tab(clubs_data, club_index)
+    
     with tab3:
-        create_resume_section()
+        create_resume_section(club_options)
     
     with tab4:
-        create_resume_analysis_section(clubs_data)
+        create_resume_analysis_section(clubs_data, club_options)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
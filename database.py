@@ -1,54 +1,194 @@
-import pandas as pd
 import pymongo
-from pymongo import MongoClient
+from pymongo import MongoClient, InsertOne
 import csv
 import os
-from datetime import datetime
+import atexit
+import threading
+from datetime import datetime, timezone
+
+# One pooled client per connection string, shared by every store in the process
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+def get_mongo_client(connection_string=None):
+    """
+    Return the process-wide MongoClient for a connection string, creating it on first use
+    (default: MONGODB_CONNECTION_STRING, then a local server)
+    """
+    connection_string = connection_string or os.getenv("MONGODB_CONNECTION_STRING", "mongodb://localhost:27017/")
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(connection_string)
+        if client is None:
+            client = MongoClient(
+                connection_string,
+                maxPoolSize=100,
+                minPoolSize=10,
+                socketTimeoutMS=30000,
+                retryWrites=True,
+                tz_aware=True  # Every store reads back UTC-aware datetimes
+            )
+            _CLIENTS[connection_string] = client
+        return client
+
+@atexit.register
+def _close_clients():
+    """
+    Close the shared clients when the process exits
+    """
+    for client in _CLIENTS.values():
+        client.close()
+
+# Rows per bulk_write when loading the clubs CSV
+CSV_BATCH_SIZE = 1000
+
+def normalize_friendliness(value):
+    """
+    Classify a free-text freshman friendliness rating as very_high/high/medium/low/na
+    """
+    if not isinstance(value, str):
+        return "na"
+    value = value.lower()
+    if "very high" in value:
+        return "very_high"
+    elif "high" in value:
+        return "high"
+    elif "medium" in value:
+        return "medium"
+    elif "low" in value:
+        return "low"
+    return "na"
+
+def normalize_recruitment(value):
+    """
+    Classify a free-text recruitment description as open/application/invitation/other
+    """
+    if not isinstance(value, str):
+        return "other"
+    value = value.lower()
+    if "open" in value:
+        return "open"
+    elif "application" in value:
+        return "application"
+    elif "invitation" in value:
+        return "invitation"
+    return "other"
 
 class CSClubsDatabase:
-    def __init__(self, connection_string="mongodb://localhost:27017/", database_name="cs_clubs_db", collection_name="clubs"):
+    # Fields the app reads from each club; _id and anything else stay in MongoDB
+    CLUB_PROJECTION = {
+        "_id": 0,
+        "Club Name": 1,
+        "Acronym": 1,
+        "Primary Focus": 1,
+        "Typical Activities": 1,
+        "How to Join/Learn More": 1,
+        "Typical Recruitment": 1,
+        "Website": 1,
+        "ApplicationLink": 1,
+        "Fall Application Time": 1,
+        "Freshman Friendliness (General Vibe)": 1,
+        "Notes for EECS Freshmen": 1,
+        "norm_friendliness": 1,
+        "norm_recruitment": 1
+    }
+    
+    def __init__(self, connection_string=None, database_name="cs_clubs_db", collection_name="clubs"):
         """
         Initialize the MongoDB connection
         """
-        self.client = MongoClient(connection_string)
+        # Shared pooled client (the same one the resume and analysis stores use); avoids a new
+        # handshake and server discovery per instance
+        self.client = get_mongo_client(connection_string)
         self.database = self.client[database_name]
         self.collection = self.database[collection_name]
         self.favorites_collection = self.database.user_favorites
         
+        self._create_club_indexes()
+        
+        # Favorites are looked up by (user_id, club_name); the compound index covers those reads
+        try:
+            self.favorites_collection.create_index(
+                [("user_id", 1), ("club_name", 1)],
+                unique=True,
+                name="user_club"
+            )
+        except Exception as e:
+            print(f"Error creating favorites index: {str(e)}")
+        
+    def _create_club_indexes(self):
+        """
+        Text index for search_clubs and an equality index for the friendliness tag (idempotent)
+        """
+        try:
+            self.collection.create_index(
+                [("Club Name", "text"), ("Acronym", "text"), ("Primary Focus", "text")],
+                name="club_text"
+            )
+            self.collection.create_index("norm_friendliness")
+        except Exception as e:
+            print(f"Error creating club indexes: {str(e)}")
+    
     def load_csv_to_mongodb(self, csv_file_path):
         """
         Load CSV data into MongoDB
         """
+        # Load into a staging collection and swap it in, so a bad file leaves the current clubs intact
+        staging = self.database[f"{self.collection.name}_staging"]
         try:
-            # Read CSV file
-            df = pd.read_csv(csv_file_path)
+            staging.drop()
             
-            # Convert DataFrame to dictionary records
-            records = df.to_dict('records')
+            # Stream rows from the CSV and insert them in unordered batches
+            inserted = 0
+            ops = []
+            with open(csv_file_path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    # Store normalized tags so readers compare instead of re-scanning text
+                    row["norm_friendliness"] = normalize_friendliness(row.get("Freshman Friendliness (General Vibe)"))
+                    row["norm_recruitment"] = normalize_recruitment(row.get("Typical Recruitment"))
+                    ops.append(InsertOne(row))
+                    if len(ops) >= CSV_BATCH_SIZE:
+                        inserted += staging.bulk_write(ops, ordered=False).inserted_count
+                        ops.clear()
+            if ops:
+                inserted += staging.bulk_write(ops, ordered=False).inserted_count
             
-            # Clear existing data
-            self.collection.delete_many({})
+            if inserted == 0:
+                print(f"No rows found in {csv_file_path}; existing clubs left unchanged")
+                return False
             
-            # Insert new data
-            result = self.collection.insert_many(records)
+            # Atomically replace the live collection, then rebuild its indexes
+            staging.rename(self.collection.name, dropTarget=True)
+            self._create_club_indexes()
             
-            print(f"Successfully inserted {len(result.inserted_ids)} records into MongoDB")
+            print(f"Successfully inserted {inserted} records into MongoDB")
             return True
             
         except Exception as e:
             print(f"Error loading CSV to MongoDB: {str(e)}")
             return False
+        finally:
+            # No-op after a successful rename; otherwise discard the partial load
+            try:
+                staging.drop()
+            except Exception:
+                pass
     
-    def get_all_clubs(self):
+    def iter_clubs(self, limit=None, skip=0):
         """
-        Retrieve all clubs from MongoDB
+        Stream clubs from MongoDB in batches, optionally one page at a time
         """
         try:
-            clubs = list(self.collection.find({}, {'_id': 0}))  # Exclude MongoDB's _id field
-            return clubs
+            cursor = self.collection.find({}, self.CLUB_PROJECTION).skip(skip).limit(limit or 0).batch_size(200)
+            for club in cursor:
+                yield club
         except Exception as e:
             print(f"Error retrieving clubs: {str(e)}")
-            return []
+    
+    def get_all_clubs(self):
+        """
+        Retrieve all clubs from MongoDB
+        """
+        return list(self.iter_clubs())
     
     def get_club_by_name(self, club_name):
         """
@@ -66,14 +206,12 @@ class CSClubsDatabase:
         Search clubs by name, acronym, or primary focus
         """
         try:
-            query = {
-                "$or": [
-                    {"Club Name": {"$regex": search_term, "$options": "i"}},
-                    {"Acronym": {"$regex": search_term, "$options": "i"}},
-                    {"Primary Focus": {"$regex": search_term, "$options": "i"}}
-                ]
-            }
-            clubs = list(self.collection.find(query, {'_id': 0}))
+            clubs = list(
+                self.collection.find(
+                    {"$text": {"$search": search_term}},
+                    {**self.CLUB_PROJECTION, "score": {"$meta": "textScore"}}
+                ).sort([("score", {"$meta": "textScore"})])
+            )
             return clubs
         except Exception as e:
             print(f"Error searching clubs: {str(e)}")
@@ -84,8 +222,9 @@ class CSClubsDatabase:
         Filter clubs by freshman friendliness level
         """
         try:
-            query = {"Freshman Friendliness (General Vibe)": {"$regex": friendliness_level, "$options": "i"}}
-            clubs = list(self.collection.find(query, {'_id': 0}))
+            # Accept either a display label ("Very High") or a tag ("very_high")
+            norm_level = friendliness_level.strip().lower().replace(" ", "_")
+            clubs = list(self.collection.find({"norm_friendliness": norm_level}, self.CLUB_PROJECTION))
             return clubs
         except Exception as e:
             print(f"Error filtering clubs: {str(e)}")
@@ -123,7 +262,7 @@ class CSClubsDatabase:
             favorite_doc = {
                 "user_id": user_id,
                 "club_name": club_name,
-                "favorited_at": datetime.now()
+                "favorited_at": datetime.now(timezone.utc)
             }
             
             # Use upsert to avoid duplicates
@@ -151,6 +290,32 @@ class CSClubsDatabase:
             print(f"Error removing favorite: {str(e)}")
             return False
     
+    def toggle_favorite_atomic(self, user_id, club_name):
+        """
+        Toggle a club in user's favorites without a separate existence check
+        Returns:
+            tuple: (now_favorited, success)
+        """
+        try:
+            # Removing succeeds only if the club was favorited
+            result = self.favorites_collection.delete_one({
+                "user_id": user_id,
+                "club_name": club_name
+            })
+            if result.deleted_count > 0:
+                return False, True
+            
+            # Otherwise add it; $setOnInsert keeps a concurrent add idempotent
+            self.favorites_collection.update_one(
+                {"user_id": user_id, "club_name": club_name},
+                {"$setOnInsert": {"favorited_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+            return True, True
+        except Exception as e:
+            print(f"Error toggling favorite: {str(e)}")
+            return False, False
+    
     def get_user_favorites(self, user_id):
         """
         Get list of favorited club names for a user
@@ -170,10 +335,10 @@ class CSClubsDatabase:
         Check if a specific club is favorited by user
         """
         try:
-            result = self.favorites_collection.find_one({
-                "user_id": user_id,
-                "club_name": club_name
-            })
+            result = self.favorites_collection.find_one(
+                {"user_id": user_id, "club_name": club_name},
+                {"club_name": 1, "_id": 0}
+            )
             return result is not None
         except Exception as e:
             print(f"Error checking favorite status: {str(e)}")
@@ -192,9 +357,9 @@ class CSClubsDatabase:
 
     def close_connection(self):
         """
-        Close MongoDB connection
+        Release this handle; the shared client is closed at process exit
         """
-        self.client.close()
+        pass
 
 if __name__ == "__main__":
     # Initialize database
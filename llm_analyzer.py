@@ -1,20 +1,40 @@
 import os
 import json
+import asyncio
+import functools
+import hashlib
+import threading
+import time
+from collections import deque
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 import streamlit as st
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
+try:
+    import aiohttp
+except ImportError:  # Optional transport for high-concurrency OpenAI calls
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library parser
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
+class BatchFailedError(RuntimeError):
+    """A submitted batch ended without results (failed, expired or cancelled)"""
+
 class LLMProvider(Enum):
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
 
-@dataclass
+@dataclass(frozen=True)
 class AnalysisResult:
     """Structured result from LLM club application strategy analysis"""
     networking_strategy: List[str]
@@ -25,65 +45,16 @@ class AnalysisResult:
     match_score: int
     strategy_summary: str
 
-class LLMAnalyzer:
-    def __init__(self):
-        self.provider = LLMProvider(os.getenv("LLM_PROVIDER", "openai"))
-        self.model = os.getenv("LLM_MODEL", "gpt-4o-mini")
-        self.max_tokens = int(os.getenv("MAX_TOKENS", "2000"))
-        self.temperature = float(os.getenv("ANALYSIS_TEMPERATURE", "0.3"))
-        
-        # Initialize the appropriate client
-        if self.provider == LLMProvider.OPENAI:
-            try:
-                import openai
-                self.client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            except ImportError:
-                st.error("OpenAI package not installed. Please install it with: pip install openai")
-                self.client = None
-        elif self.provider == LLMProvider.ANTHROPIC:
-            try:
-                import anthropic
-                self.client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-            except ImportError:
-                st.error("Anthropic package not installed. Please install it with: pip install anthropic")
-                self.client = None
-
-    def create_analysis_prompt(self, resume_text: str, club_data: Dict[str, Any]) -> str:
-        """Create a comprehensive club application strategy prompt"""
-        
-        # Extract club information
-        club_name = club_data.get("Club Name", "Unknown Club")
-        primary_focus = club_data.get("Primary Focus", "Not specified")
-        typical_activities = club_data.get("Typical Activities", "Not specified")
-        typical_recruitment = club_data.get("Typical Recruitment", "Not specified")
-        freshman_friendliness = club_data.get("Freshman Friendliness (General Vibe)", "Not specified")
-        notes_for_freshmen = club_data.get("Notes for EECS Freshmen", "Not specified")
-        how_to_join = club_data.get("How to Join/Learn More", "Not specified")
-        website = club_data.get("Website", "Not specified")
-        application_link = club_data.get("ApplicationLink", "Not specified")
-        
-        prompt = f"""
+# Static role, JSON schema and guidelines, sent ahead of the per-call club and resume
+# data so providers can reuse the cached prompt prefix across requests
+ANALYSIS_INSTRUCTIONS = """
 You are an expert student advisor specializing in UC Berkeley club applications and networking strategies. 
-Create a comprehensive, step-by-step guide for successfully getting into this specific club.
-
-CLUB INFORMATION:
-- Club Name: {club_name}
-- Primary Focus: {primary_focus}
-- Typical Activities: {typical_activities}
-- Recruitment Process: {typical_recruitment}
-- Freshman Friendliness: {freshman_friendliness}
-- Special Notes: {notes_for_freshmen}
-- How to Join: {how_to_join}
-- Website: {website}
-- Application Link: {application_link}
-
-STUDENT'S BACKGROUND (from resume):
-{resume_text}
+Create a comprehensive, step-by-step guide for successfully getting into the club described in the user message.
 
 STRATEGY REQUIREMENTS:
 Create a structured action plan in the following JSON format:
 
-{{
+{
     "networking_strategy": [
         "Specific steps for coffee chats (who to reach out to, how to find contacts)",
         "LinkedIn connection strategies for club members/alumni",
@@ -114,7 +85,7 @@ Create a structured action plan in the following JSON format:
     ],
     "match_score": null,
     "strategy_summary": "2-3 sentence overview of the recommended approach and likelihood of success"
-}}
+}
 
 CRITICAL: Replace the null value in match_score with a calculated integer from 0-100.
 Base your calculation on:
@@ -140,45 +111,315 @@ Research publicly available information about this club when possible and incorp
 
 Provide only the JSON response with no additional text.
 """
-        return prompt
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def call_llm(self, prompt: str) -> str:
-        """Make LLM API call with retry logic"""
+# Anthropic caches only when asked; mark the instructions block as a cache breakpoint
+ANTHROPIC_SYSTEM_BLOCKS = [{"type": "text", "text": ANALYSIS_INSTRUCTIONS, "cache_control": {"type": "ephemeral"}}]
+
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+# Mirrors AnalysisResult; OpenAI structured outputs constrain replies to exactly this shape
+OPENAI_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "AnalysisResult",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "networking_strategy": _STRING_LIST,
+                "campus_resources": _STRING_LIST,
+                "application_timeline": _STRING_LIST,
+                "preparation_steps": _STRING_LIST,
+                "improvements": _STRING_LIST,
+                "match_score": {"type": "integer"},
+                "strategy_summary": {"type": "string"}
+            },
+            "required": [
+                "networking_strategy", "campus_resources", "application_timeline",
+                "preparation_steps", "improvements", "match_score", "strategy_summary"
+            ],
+            "additionalProperties": False
+        }
+    }
+}
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch one type either way
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+class ResponseCache:
+    """In-process cache of raw LLM responses keyed by a hash of model and prompt"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: int = 24 * 60 * 60):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        """Hash the exact model and prompt text"""
+        return hashlib.sha256((model + prompt).encode()).hexdigest()
+    
+    def get(self, prompt_hash: str) -> Optional[str]:
+        with self._lock:
+            return self._cache.get(prompt_hash)
+    
+    def set(self, prompt_hash: str, response: str) -> None:
+        with self._lock:
+            self._cache[prompt_hash] = response
+
+# Shared across analyzer instances so identical prompts are answered once per day
+_response_cache = ResponseCache()
+
+# Club fields shown to the model, in prompt order, with their labels
+CLUB_PROMPT_FIELDS = (
+    "Club Name",
+    "Primary Focus",
+    "Typical Activities",
+    "Typical Recruitment",
+    "Freshman Friendliness (General Vibe)",
+    "Notes for EECS Freshmen",
+    "How to Join/Learn More",
+    "Website",
+    "ApplicationLink"
+)
+CLUB_PROMPT_LABELS = (
+    "Club Name",
+    "Primary Focus",
+    "Typical Activities",
+    "Recruitment Process",
+    "Freshman Friendliness",
+    "Special Notes",
+    "How to Join",
+    "Website",
+    "Application Link"
+)
+
+@functools.lru_cache(maxsize=512)
+def _club_block(club_values: Tuple[Any, ...]) -> str:
+    """CLUB INFORMATION section for one club; the same club is formatted once per process"""
+    lines = "".join(f"- {label}: {value}\n" for label, value in zip(CLUB_PROMPT_LABELS, club_values))
+    return f"\nCLUB INFORMATION:\n{lines}"
+
+class RateLimiter:
+    """Sliding-window limiter that waits before sending instead of after a 429"""
+    
+    def __init__(self, max_calls: int, window_s: float = 60.0):
+        self.max_calls = max_calls
+        self.window_s = window_s
+        self._calls = deque()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Claim a slot and return 0, or return how long to wait for the next one"""
+        with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= self.window_s:
+                self._calls.popleft()
+            if len(self._calls) < self.max_calls:
+                self._calls.append(now)
+                return 0.0
+            return self._calls[0] + self.window_s - now
+    
+    async def acquire(self) -> None:
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+    
+    def acquire_sync(self) -> None:
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+# One budget for every analyzer in the process, since they share the same API key
+_rate_limiter = RateLimiter(int(os.getenv("LLM_MAX_QPM", "500")))
+
+def _collect_retryable_errors() -> Tuple[type, ...]:
+    """Rate-limit, timeout, connection and server errors from whichever SDKs are installed"""
+    errors = []
+    for module_name in ("openai", "anthropic"):
         try:
-            if self.provider == LLMProvider.OPENAI:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature
-                )
-                return response.choices[0].message.content
-            
-            elif self.provider == LLMProvider.ANTHROPIC:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                return response.content[0].text
-                
-        except Exception as e:
-            st.error(f"LLM API call failed: {str(e)}")
-            raise
+            module = __import__(module_name)
+        except ImportError:
+            continue
+        for name in ("RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError"):
+            error = getattr(module, name, None)
+            if error is not None:
+                errors.append(error)
+    return tuple(errors)
+
+_RETRYABLE_ERRORS = _collect_retryable_errors()
+
+def _is_retryable(error: BaseException) -> bool:
+    """Retry transient failures only; bad requests and auth errors fail fast"""
+    if isinstance(error, _RETRYABLE_ERRORS):
+        return True
+    if aiohttp is not None:
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status == 429 or error.status >= 500
+        return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+    return False
+
+# Jittered backoff so concurrent requests that hit a 429 together do not retry in lockstep
+_llm_retry = retry(
+    retry=retry_if_exception(_is_retryable),
+    stop=stop_after_attempt(5),
+    wait=wait_random_exponential(multiplier=1, min=2, max=30)
+)
+
+class LLMAnalyzer:
+    def __init__(self):
+        self.provider = LLMProvider(os.getenv("LLM_PROVIDER", "openai"))
+        self.model = os.getenv("LLM_MODEL", "gpt-4o-mini")
+        self.max_tokens = int(os.getenv("MAX_TOKENS", "2000"))
+        self.temperature = float(os.getenv("ANALYSIS_TEMPERATURE", "0.3"))
+        # Post straight to the OpenAI REST API with aiohttp in the concurrent path when enabled
+        self.use_aiohttp = (
+            os.getenv("LLM_USE_AIOHTTP") == "1"
+            and aiohttp is not None
+            and self.provider == LLMProvider.OPENAI
+        )
+        
+        # Initialize the appropriate client
+        if self.provider == LLMProvider.OPENAI:
+            try:
+                import openai
+                self.client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            except ImportError:
+                st.error("OpenAI package not installed. Please install it with: pip install openai")
+                self.client = None
+        elif self.provider == LLMProvider.ANTHROPIC:
+            try:
+                import anthropic
+                self.client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+            except ImportError:
+                st.error("Anthropic package not installed. Please install it with: pip install anthropic")
+                self.client = None
+
+    def create_analysis_prompt(self, resume_text: str, club_data: Dict[str, Any]) -> str:
+        """Create the per-call part of the strategy prompt; instructions go in ANALYSIS_INSTRUCTIONS"""
+        club_block = _club_block(tuple(
+            club_data.get(field, "Unknown Club" if field == "Club Name" else "Not specified")
+            for field in CLUB_PROMPT_FIELDS
+        ))
+        
+        # Variable content only, so the static instructions stay a cacheable prefix
+        return f"{club_block}\nSTUDENT'S BACKGROUND (from resume):\n{resume_text}\n"
+
+    @_llm_retry
+    def _open_stream(self, prompt: str):
+        """Start a streamed completion; connection errors and 429s surface here and are retried"""
+        _rate_limiter.acquire_sync()
+        if self.provider == LLMProvider.OPENAI:
+            return self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": ANALYSIS_INSTRUCTIONS},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                response_format=OPENAI_RESPONSE_FORMAT,
+                stream=True
+            )
+        elif self.provider == LLMProvider.ANTHROPIC:
+            return self.client.messages.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                system=ANTHROPIC_SYSTEM_BLOCKS,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            )
+
+    def stream_llm(self, prompt: str):
+        """Yield the response text as it is generated, for st.write_stream"""
+        stream = self._open_stream(prompt)
+        if self.provider == LLMProvider.OPENAI:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        elif self.provider == LLMProvider.ANTHROPIC:
+            for event in stream:
+                if event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    yield event.delta.text
+
+    def _create_async_client(self):
+        """Create an async client for one batch; async clients are bound to the event loop that uses them"""
+        if self.use_aiohttp:
+            return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=64, limit_per_host=64))
+        elif self.provider == LLMProvider.OPENAI:
+            import openai
+            return openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        elif self.provider == LLMProvider.ANTHROPIC:
+            import anthropic
+            return anthropic.AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+
+    @_llm_retry
+    async def _acall_llm(self, async_client, prompt: str) -> str:
+        """Async counterpart of _open_stream without streaming, used for concurrent multi-club analysis"""
+        await _rate_limiter.acquire()
+        if self.use_aiohttp:
+            return await self._aiohttp_chat(async_client, prompt)
+        elif self.provider == LLMProvider.OPENAI:
+            response = await async_client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": ANALYSIS_INSTRUCTIONS},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                response_format=OPENAI_RESPONSE_FORMAT
+            )
+            return response.choices[0].message.content
+        
+        elif self.provider == LLMProvider.ANTHROPIC:
+            response = await async_client.messages.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                system=ANTHROPIC_SYSTEM_BLOCKS,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            return response.content[0].text
+
+    async def _aiohttp_chat(self, session, prompt: str) -> str:
+        """Call the OpenAI chat completions endpoint directly over an aiohttp session"""
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": ANALYSIS_INSTRUCTIONS},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "response_format": OPENAI_RESPONSE_FORMAT
+        }
+        headers = {"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}"}
+        async with session.post(OPENAI_CHAT_URL, json=payload, headers=headers) as response:
+            # 429s and 5xx raise here and are retried by _acall_llm
+            response.raise_for_status()
+            data = await response.json()
+        return data["choices"][0]["message"]["content"]
 
     def parse_llm_response(self, response: str) -> AnalysisResult:
         """Parse LLM response into structured format"""
         try:
-            # Clean the response to extract JSON
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.endswith('```'):
-                response = response[:-3]
-            
-            data = json.loads(response)
+            try:
+                data = _json_loads(response)
+            except json.JSONDecodeError:
+                # Only replies without structured outputs (Anthropic) may arrive fenced
+                response = response.strip()
+                if response.startswith('```json'):
+                    response = response[7:]
+                if response.endswith('```'):
+                    response = response[:-3]
+                data = _json_loads(response)
             
             # Handle match_score parsing more robustly
             match_score_raw = data.get("match_score", 0)
@@ -234,7 +475,7 @@ Provide only the JSON response with no additional text.
                 strategy_summary=f"Error: {str(e)}"
             )
 
-    def analyze_resume_for_club(self, resume_text: str, club_data: Dict[str, Any]) -> AnalysisResult:
+    def analyze_resume_for_club(self, resume_text: str, club_data: Dict[str, Any], use_cache: bool = True) -> AnalysisResult:
         """Complete analysis workflow for a resume-club pair"""
         if not self.client:
             st.error("LLM client not initialized. Please check your API keys and dependencies.")
@@ -252,9 +493,15 @@ Provide only the JSON response with no additional text.
             # Create the analysis prompt
             prompt = self.create_analysis_prompt(resume_text, club_data)
             
-            # Call LLM
-            with st.spinner(f"Analyzing resume for {club_data.get('Club Name', 'Unknown Club')}..."):
-                response = self.call_llm(prompt)
+            # Reuse the response for an identical prompt, otherwise call the LLM
+            prompt_hash = ResponseCache.key(self.model, prompt)
+            response = _response_cache.get(prompt_hash) if use_cache else None
+            if response is None:
+                # Stream tokens into a collapsible panel so output shows as soon as the first ones arrive
+                with st.status(f"Analyzing resume for {club_data.get('Club Name', 'Unknown Club')}...") as status:
+                    response = st.write_stream(self.stream_llm(prompt))
+                    status.update(label="Analysis complete", state="complete", expanded=False)
+                _response_cache.set(prompt_hash, response)
             
             # Parse response
             result = self.parse_llm_response(response)
@@ -273,31 +520,182 @@ Provide only the JSON response with no additional text.
                 strategy_summary=f"Analysis failed: {str(e)}"
             )
 
-    def analyze_resume_for_multiple_clubs(self, resume_text: str, clubs_data: List[Dict[str, Any]]) -> List[Tuple[str, AnalysisResult]]:
-        """Analyze resume against multiple clubs"""
-        results = []
+    def _failed_result(self, club_name: str, error: Exception) -> AnalysisResult:
+        """Placeholder result for a club whose analysis raised"""
+        return AnalysisResult(
+            networking_strategy=[f"Analysis failed for {club_name}"],
+            campus_resources=["Please try again"],
+            application_timeline=["Error occurred"],
+            preparation_steps=["Retry recommended"],
+            improvements=["Please try again"],
+            match_score=0,
+            strategy_summary=f"Analysis failed: {str(error)}"
+        )
+
+    async def _aanalyze_one(self, async_client, semaphore: asyncio.Semaphore, resume_text: str, club_data: Dict[str, Any], use_cache: bool = True, on_done=None) -> AnalysisResult:
+        """Build the prompt, await the LLM and parse the reply for one club"""
+        try:
+            prompt = self.create_analysis_prompt(resume_text, club_data)
+            prompt_hash = ResponseCache.key(self.model, prompt)
+            response = _response_cache.get(prompt_hash) if use_cache else None
+            if response is None:
+                async with semaphore:
+                    response = await self._acall_llm(async_client, prompt)
+                _response_cache.set(prompt_hash, response)
+            return self.parse_llm_response(response)
+        finally:
+            if on_done is not None:
+                on_done()
+
+    async def _aanalyze_all(self, resume_text: str, clubs_data: List[Dict[str, Any]], use_cache: bool = True, on_done=None) -> List[Any]:
+        """Run every club analysis concurrently, bounded by LLM_CONCURRENCY; on_done fires as each club finishes"""
+        semaphore = asyncio.Semaphore(int(os.getenv("LLM_CONCURRENCY", "8")))
+        async_client = self._create_async_client()
+        try:
+            return await asyncio.gather(
+                *(self._aanalyze_one(async_client, semaphore, resume_text, club_data, use_cache, on_done) for club_data in clubs_data),
+                return_exceptions=True
+            )
+        finally:
+            await async_client.close()
+
+    def analyze_resume_for_multiple_clubs(self, resume_text: str, clubs_data: List[Dict[str, Any]], use_cache: bool = True) -> List[Tuple[str, AnalysisResult]]:
+        """Analyze resume against multiple clubs concurrently"""
+        if not self.client:
+            # Falls through to the single-club path, which reports the missing client
+            return [(club_data.get("Club Name", "Unknown Club"), self.analyze_resume_for_club(resume_text, club_data, use_cache))
+                    for club_data in clubs_data]
+        
+        # One bar for the whole run; completions all land on this thread's event loop
+        total = len(clubs_data)
+        done = 0
+        progress = st.progress(0.0, text=f"Analyzed 0/{total} clubs")
+        
+        def on_done():
+            nonlocal done
+            done += 1
+            progress.progress(done / total, text=f"Analyzed {done}/{total} clubs")
+        
+        outcomes = asyncio.run(self._aanalyze_all(resume_text, clubs_data, use_cache, on_done))
+        progress.empty()
         
-        for club_data in clubs_data:
+        # gather preserves input order, so results line up with clubs_data
+        results = []
+        for club_data, outcome in zip(clubs_data, outcomes):
             club_name = club_data.get("Club Name", "Unknown Club")
+            if isinstance(outcome, Exception):
+                st.error(f"Failed to analyze for {club_name}: {str(outcome)}")
+                outcome = self._failed_result(club_name, outcome)
+            results.append((club_name, outcome))
+        
+        return results
+
+    def _batch_custom_id(self, index: int) -> str:
+        """Batch request IDs must be short and URL-safe, so use the club's position"""
+        return f"club-{index}"
+
+    def submit_batch(self, resume_text: str, clubs_data: List[Dict[str, Any]]) -> Optional[str]:
+        """Submit one analysis per club to the provider's batch API; returns the batch ID"""
+        if not self.client:
+            st.error("LLM client not initialized. Please check your API keys and dependencies.")
+            return None
+        
+        try:
+            prompts = [self.create_analysis_prompt(resume_text, club_data) for club_data in clubs_data]
             
-            try:
-                result = self.analyze_resume_for_club(resume_text, club_data)
-                results.append((club_name, result))
-            except Exception as e:
-                st.error(f"Failed to analyze for {club_name}: {str(e)}")
-                # Add a failed result
-                failed_result = AnalysisResult(
-                    networking_strategy=[f"Analysis failed for {club_name}"],
-                    campus_resources=["Please try again"],
-                    application_timeline=["Error occurred"],
-                    preparation_steps=["Retry recommended"],
-                    improvements=["Please try again"],
-                    match_score=0,
-                    strategy_summary=f"Analysis failed: {str(e)}"
+            if self.provider == LLMProvider.OPENAI:
+                lines = [
+                    json.dumps({
+                        "custom_id": self._batch_custom_id(i),
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": self.model,
+                            "messages": [
+                                {"role": "system", "content": ANALYSIS_INSTRUCTIONS},
+                                {"role": "user", "content": prompt}
+                            ],
+                            "max_tokens": self.max_tokens,
+                            "temperature": self.temperature,
+                            "response_format": OPENAI_RESPONSE_FORMAT
+                        }
+                    })
+                    for i, prompt in enumerate(prompts)
+                ]
+                input_file = self.client.files.create(
+                    file=("club_analyses.jsonl", "\n".join(lines).encode()),
+                    purpose="batch"
+                )
+                batch = self.client.batches.create(
+                    input_file_id=input_file.id,
+                    endpoint="/v1/chat/completions",
+                    completion_window="24h"
                 )
-                results.append((club_name, failed_result))
+                return batch.id
+            
+            elif self.provider == LLMProvider.ANTHROPIC:
+                batch = self.client.messages.batches.create(requests=[
+                    {
+                        "custom_id": self._batch_custom_id(i),
+                        "params": {
+                            "model": self.model,
+                            "max_tokens": self.max_tokens,
+                            "temperature": self.temperature,
+                            "system": ANTHROPIC_SYSTEM_BLOCKS,
+                            "messages": [{"role": "user", "content": prompt}]
+                        }
+                    }
+                    for i, prompt in enumerate(prompts)
+                ])
+                return batch.id
+                
+        except Exception as e:
+            st.error(f"Batch submission failed: {str(e)}")
+            return None
+
+    def poll_batch(self, batch_id: str, club_names: List[str]) -> Tuple[int, int, Optional[List[Tuple[str, AnalysisResult]]]]:
+        """Check a submitted batch; returns (finished, total, results), with results None while it is still running.
+        Raises BatchFailedError if the batch failed, expired or was cancelled, and the SDK's error if it cannot be checked."""
+        responses = {}
         
-        return results
+        if self.provider == LLMProvider.OPENAI:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise BatchFailedError(f"Batch {batch_id} {batch.status}")
+            counts = batch.request_counts
+            total = counts.total if counts and counts.total else len(club_names)
+            if batch.status != "completed":
+                done = counts.completed + counts.failed if counts else 0
+                return done, total, None
+            
+            if batch.output_file_id:
+                for line in self.client.files.content(batch.output_file_id).text.splitlines():
+                    record = json.loads(line)
+                    response = record.get("response") or {}
+                    if response.get("status_code") == 200:
+                        responses[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        
+        elif self.provider == LLMProvider.ANTHROPIC:
+            batch = self.client.messages.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            done = counts.succeeded + counts.errored + counts.canceled + counts.expired
+            total = done + counts.processing
+            if batch.processing_status != "ended":
+                return done, total, None
+            
+            for entry in self.client.messages.batches.results(batch_id):
+                if entry.result.type == "succeeded":
+                    responses[entry.custom_id] = entry.result.message.content[0].text
+        
+        # Requests that errored or expired get the usual failed placeholder
+        results = []
+        for i, club_name in enumerate(club_names):
+            response = responses.get(self._batch_custom_id(i))
+            if response is None:
+                results.append((club_name, self._failed_result(club_name, Exception("batch request did not succeed"))))
+            else:
+                results.append((club_name, self.parse_llm_response(response)))
+        return total, total, results
 
     def get_comparative_analysis(self, resume_text: str, clubs_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate comparative analysis across multiple clubs"""
@@ -310,46 +708,44 @@ Provide only the JSON response with no additional text.
         # Sort by match score
         sorted_analyses = sorted(club_analyses, key=lambda x: x[1].match_score, reverse=True)
         
-        # Generate summary statistics
-        match_scores = [analysis[1].match_score for analysis in club_analyses]
-        avg_match_score = sum(match_scores) / len(match_scores) if match_scores else 0
+        # Bucket clubs by score and total the scores in one pass
+        total_score = 0
+        buckets = ([], [], [])
+        for club_name, analysis in sorted_analyses:
+            score = analysis.match_score
+            total_score += score
+            buckets[0 if score >= 80 else 1 if score >= 60 else 2].append(club_name)
+        avg_match_score = total_score / len(sorted_analyses) if sorted_analyses else 0
         
         return {
             "club_analyses": sorted_analyses,
             "top_match": sorted_analyses[0] if sorted_analyses else None,
             "average_match_score": avg_match_score,
             "total_clubs_analyzed": len(club_analyses),
-            "recommendation": self._generate_application_strategy(sorted_analyses)
+            "recommendation": self._generate_application_strategy(buckets)
         }
 
-    def _generate_application_strategy(self, sorted_analyses: List[Tuple[str, AnalysisResult]]) -> str:
-        """Generate application strategy based on match scores"""
-        if not sorted_analyses:
+    # (heading, advice) for the high (>=80), medium (60-79) and low (<60) score buckets
+    STRATEGY_TIERS = (
+        ("🎯 High Priority", "Apply early, these are excellent matches."),
+        ("📝 Medium Priority", "Good options with some resume improvements."),
+        ("🔄 Growth Opportunities", "Consider for skill development after building experience."),
+    )
+
+    def _generate_application_strategy(self, buckets: Tuple[List[str], List[str], List[str]]) -> str:
+        """Generate application strategy from club names bucketed by match score"""
+        if not any(buckets):
             return "No clubs analyzed."
         
-        high_match = [club for club, analysis in sorted_analyses if analysis.match_score >= 80]
-        medium_match = [club for club, analysis in sorted_analyses if 60 <= analysis.match_score < 80]
-        low_match = [club for club, analysis in sorted_analyses if analysis.match_score < 60]
-        
         strategy = "Application Strategy:\n"
         
-        if high_match:
-            strategy += f"🎯 High Priority ({len(high_match)} clubs): {', '.join(high_match[:3])}"
-            if len(high_match) > 3:
-                strategy += f" and {len(high_match) - 3} more"
-            strategy += " - Apply early, these are excellent matches.\n"
-        
-        if medium_match:
-            strategy += f"📝 Medium Priority ({len(medium_match)} clubs): {', '.join(medium_match[:3])}"
-            if len(medium_match) > 3:
-                strategy += f" and {len(medium_match) - 3} more"
-            strategy += " - Good options with some resume improvements.\n"
-        
-        if low_match:
-            strategy += f"🔄 Growth Opportunities ({len(low_match)} clubs): {', '.join(low_match[:3])}"
-            if len(low_match) > 3:
-                strategy += f" and {len(low_match) - 3} more"
-            strategy += " - Consider for skill development after building experience.\n"
+        for (heading, advice), clubs in zip(self.STRATEGY_TIERS, buckets):
+            if not clubs:
+                continue
+            strategy += f"{heading} ({len(clubs)} clubs): {', '.join(clubs[:3])}"
+            if len(clubs) > 3:
+                strategy += f" and {len(clubs) - 3} more"
+            strategy += f" - {advice}\n"
         
         return strategy
 
@@ -1,11 +1,17 @@
 import streamlit as st
-from pymongo import MongoClient
-import PyPDF2
-import io
-from datetime import datetime
-import hashlib
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError, OperationFailure
+import gridfs
+try:
+    from pypdf import PdfReader
+except ImportError:  # Older installs only have the PyPDF2 package
+    from PyPDF2 import PdfReader
+from datetime import datetime, timezone
+# Required: file_hash backs a unique index, so every host must hash with the same algorithm
+from blake3 import blake3
 from dotenv import load_dotenv
 import os
+from database import get_mongo_client
 
 # Load environment variables from .env file
 load_dotenv()
@@ -19,28 +25,48 @@ class ResumeDatabase:
             st.error("MongoDB connection string not found in .env file")
             return
         
-        self.client = MongoClient(connection_string)
+        # Process-wide pooled client shared with the clubs and analysis stores
+        self.client = get_mongo_client()
         self.db = self.client[database_name]  # Use database name from .env
         self.collection = self.db.resumes  # Create resumes collection
+        # Original PDFs live in GridFS so resume documents stay small
+        self.file_bucket = gridfs.GridFSBucket(self.db, bucket_name="resume_files")
         # Create index on filename and timestamp
         self.collection.create_index([("filename", 1), ("timestamp", -1)])
+        # One document per distinct file; save_resume relies on this for deduplication.
+        # Resumes stored before this index existed may share a file_hash, which makes the
+        # build fail; save_resume then still matches on file_hash, just without the race guarantee
+        try:
+            self.collection.create_index("file_hash", unique=True)
+        except OperationFailure as e:
+            print(f"Error creating unique file_hash index (remove duplicate resumes to enable it): {str(e)}")
+        # Backs the newest-first listing in get_all_resumes
+        self.collection.create_index([("upload_timestamp", -1)])
     
     def extract_text_from_pdf(self, pdf_file):
         """Extract text content from PDF file"""
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file.read()))
-            text_content = ""
-            
-            for page in pdf_reader.pages:
-                text_content += page.extract_text() + "\n"
+            # UploadedFile is seekable, so the reader can use it without copying the bytes
+            pdf_file.seek(0)
+            pdf_reader = PdfReader(pdf_file)
+            parts = [page.extract_text() or "" for page in pdf_reader.pages]
             
-            return text_content.strip()
+            return "\n".join(parts).strip()
         except Exception as e:
             st.error(f"Error reading PDF: {str(e)}")
             return None
     
+    def _hash_file(self, file_content, chunk_size=1 << 20):
+        """Hash an uploaded file's raw bytes without holding a second copy"""
+        hasher = blake3()
+        file_content.seek(0)
+        for chunk in iter(lambda: file_content.read(chunk_size), b""):
+            hasher.update(chunk)
+        file_content.seek(0)
+        return hasher.hexdigest()
+    
     def save_resume(self, filename, file_content, file_type="pdf"):
-        """Save resume to MongoDB"""
+        """Save resume to MongoDB; returns (resume_id, extracted_text)"""
         try:
             # Extract text content
             if file_type.lower() == "pdf":
@@ -50,61 +76,107 @@ class ResumeDatabase:
                 text_content = "Unsupported file type"
             
             if text_content is None:
-                return None
+                return None, None
             
-            # Create file hash for deduplication
-            file_hash = hashlib.md5(text_content.encode()).hexdigest()
+            # Hash the original file bytes for deduplication, in chunks
+            file_hash = self._hash_file(file_content)
             
-            # Check if similar resume already exists
-            existing = self.collection.find_one({"file_hash": file_hash})
-            if existing:
-                st.warning("A similar resume already exists in the database.")
-                return existing["_id"]
+            # Reserve the GridFS ID up front so the document can be written first
+            file_id = ObjectId()
             
             # Create resume document
             resume_doc = {
                 "filename": filename,
+                "file_id": file_id,
                 "file_type": file_type,
                 "text_content": text_content,
                 "file_hash": file_hash,
-                "upload_timestamp": datetime.now(),
+                "upload_timestamp": datetime.now(timezone.utc),
                 "character_count": len(text_content),
                 "word_count": len(text_content.split())
             }
             
-            # Insert into database
-            result = self.collection.insert_one(resume_doc)
-            return result.inserted_id
+            # Insert unless the same file is already stored; the unique index makes this race-safe
+            try:
+                upserted_id = self.collection.update_one(
+                    {"file_hash": file_hash},
+                    {"$setOnInsert": resume_doc},
+                    upsert=True
+                ).upserted_id
+            except DuplicateKeyError:
+                # A concurrent upload of the same file won the insert
+                upserted_id = None
+            if upserted_id is None:
+                st.warning("A similar resume already exists in the database.")
+                existing = self.collection.find_one({"file_hash": file_hash}, {"_id": 1})
+                return existing["_id"], text_content
+            
+            # Stream the original file into GridFS in chunks
+            try:
+                file_content.seek(0)
+                self.file_bucket.upload_from_stream_with_id(file_id, filename, file_content)
+            except Exception:
+                # Do not leave a resume pointing at a file that was never stored
+                self.collection.delete_one({"_id": upserted_id})
+                raise
+            
+            return upserted_id, text_content
             
         except Exception as e:
             st.error(f"Error saving resume: {str(e)}")
-            return None
+            return None, None
     
-    def get_all_resumes(self):
-        """Get all resumes from database"""
+    def get_all_resumes(self, skip=0, limit=None, projection=None):
+        """Get resume metadata newest first, optionally one page at a time; use get_resume_text for the full text"""
+        if projection is None:
+            projection = {"text_content": 0}
         try:
-            resumes = list(self.collection.find().sort("upload_timestamp", -1))
+            resumes = list(
+                self.collection.find({}, projection)
+                .sort("upload_timestamp", -1)
+                .skip(skip)
+                .limit(limit or 0)
+            )
             return resumes
         except Exception as e:
             st.error(f"Error fetching resumes: {str(e)}")
             return []
     
-    def get_resume_by_id(self, resume_id):
+    def get_resume_by_id(self, resume_id, projection=None):
         """Get specific resume by ID"""
         try:
-            from bson import ObjectId
-            resume = self.collection.find_one({"_id": ObjectId(resume_id)})
+            resume = self.collection.find_one({"_id": ObjectId(resume_id)}, projection)
             return resume
         except Exception as e:
             st.error(f"Error fetching resume: {str(e)}")
             return None
     
+    def get_resume_text(self, resume_id):
+        """Get only the extracted text of a resume"""
+        resume = self.get_resume_by_id(resume_id, {"text_content": 1, "_id": 0})
+        return resume["text_content"] if resume else None
+    
+    def get_resume_file(self, file_id):
+        """Get the original uploaded file bytes from GridFS"""
+        try:
+            return self.file_bucket.open_download_stream(file_id).read()
+        except Exception as e:
+            st.error(f"Error fetching resume file: {str(e)}")
+            return None
+    
     def delete_resume(self, resume_id):
-        """Delete resume from database"""
+        """Delete resume (and its stored file) from database"""
         try:
-            from bson import ObjectId
-            result = self.collection.delete_one({"_id": ObjectId(resume_id)})
-            return result.deleted_count > 0
+            resume = self.collection.find_one_and_delete(
+                {"_id": ObjectId(resume_id)},
+                projection={"file_id": 1}
+            )
+            if resume is None:
+                return False
+            
+            if resume.get("file_id"):
+                self.file_bucket.delete(resume["file_id"])
+            return True
         except Exception as e:
             st.error(f"Error deleting resume: {str(e)}")
             return False
@@ -126,5 +198,5 @@ class ResumeDatabase:
             return {"total_resumes": 0, "avg_word_count": 0}
     
     def close_connection(self):
-        """Close database connection"""
-        self.client.close()
\ No newline at end of file
+        """No-op: the shared MongoClient lives for the process lifetime"""
+        pass
\ No newline at end of file